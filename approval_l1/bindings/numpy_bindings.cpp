@@ -1,6 +1,10 @@
 #include <algorithm>
+#include <functional>
 #include <vector>
 
+#include "approvalwise_vector.hpp"
+#include "basin_hopping.hpp"
+#include "brute.hpp"
 #include "definitions.hpp"
 #include "greedy_dp.hpp"
 #include "pairs.hpp"
@@ -8,10 +12,9 @@
 using algorithm_t = std::function<std::pair<approvalwise_vector_t, int>(
     const std::vector<approvalwise_vector_t>&, const int)>;
 
-int32_t __create_biding(int32_t* approvalwise_vectors, int32_t num_voters,
-                        int32_t num_candidates, int32_t num_instances,
-                        int32_t* new_approvalwise_vector,
-                        algorithm_t algorithm) {
+std::vector<approvalwise_vector_t> __load_vectors(
+    int32_t* approvalwise_vectors, int32_t num_candidates,
+    int32_t num_instances) {
     std::vector<approvalwise_vector_t> approvalwise_vectors_vec;
     for (int32_t i = 0; i < num_instances; i++) {
         approvalwise_vector_t approvalwise_vector(
@@ -19,26 +22,198 @@ int32_t __create_biding(int32_t* approvalwise_vectors, int32_t num_voters,
             approvalwise_vectors + (i + 1) * num_candidates);
         approvalwise_vectors_vec.push_back(approvalwise_vector);
     }
+    return approvalwise_vectors_vec;
+}
+
+int32_t __create_biding(int32_t* approvalwise_vectors, int32_t num_voters,
+                        int32_t num_candidates, int32_t num_instances,
+                        int32_t* new_approvalwise_vector,
+                        algorithm_t algorithm) {
+    auto approvalwise_vectors_vec =
+        __load_vectors(approvalwise_vectors, num_candidates, num_instances);
     auto [result_vec, result_dist] =
         algorithm(approvalwise_vectors_vec, num_voters);
     std::copy(result_vec.begin(), result_vec.end(), new_approvalwise_vector);
     return result_dist;
 }
+// References kept on the native side between calls, so sequential runs pass
+// only appended vectors instead of the whole set on every call. The
+// candidate-major matrix of the kernels is kept along and appended to as well.
+struct NativeVectorSet {
+    int32_t num_voters;
+    int32_t num_candidates;
+    std::vector<approvalwise_vector_t> vectors;
+    ReferenceMatrix references;
+};
+
+using vector_set_algorithm_t =
+    std::function<std::pair<approvalwise_vector_t, int>(
+        const NativeVectorSet&)>;
+
+int32_t __vector_set_binding(void* vector_set,
+                             int32_t* new_approvalwise_vector,
+                             vector_set_algorithm_t algorithm) {
+    const auto& set = *static_cast<NativeVectorSet*>(vector_set);
+    auto [result_vec, result_dist] = algorithm(set);
+    std::copy(result_vec.begin(), result_vec.end(), new_approvalwise_vector);
+    return result_dist;
+}
 extern "C" {
 
+int32_t brute_binding(int32_t* approvalwise_vectors, int32_t num_voters,
+                      int32_t num_candidates, int32_t num_instances,
+                      int32_t* new_approvalwise_vector) {
+    return __create_biding(approvalwise_vectors, num_voters, num_candidates,
+                           num_instances, new_approvalwise_vector,
+                           brute::farthest_approvalwise_vector);
+}
+
 int32_t greedy_dp_binding(int32_t* approvalwise_vectors, int32_t num_voters,
                           int32_t num_candidates, int32_t num_instances,
+                          int32_t num_threads,
                           int32_t* new_approvalwise_vector) {
+    auto algorithm = [&](const std::vector<approvalwise_vector_t>& vectors,
+                         const int num_voters) {
+        return greedy_dp::farthest_approvalwise_vector(vectors, num_voters,
+                                                       num_threads);
+    };
     return __create_biding(approvalwise_vectors, num_voters, num_candidates,
-                           num_instances, new_approvalwise_vector,
-                           greedy_dp::farthest_approvalwise_vector);
+                           num_instances, new_approvalwise_vector, algorithm);
+}
+
+// Writes up to `max_results` vectors of one greedy DP pass as rows of
+// `new_approvalwise_vectors` and their distances to `distances`. Returns the
+// number of written vectors.
+int32_t greedy_dp_candidates_binding(int32_t* approvalwise_vectors,
+                                     int32_t num_voters,
+                                     int32_t num_candidates,
+                                     int32_t num_instances, int32_t max_results,
+                                     int32_t num_threads,
+                                     int32_t* new_approvalwise_vectors,
+                                     int32_t* distances) {
+    auto results = greedy_dp::farthest_approvalwise_vectors(
+        __load_vectors(approvalwise_vectors, num_candidates, num_instances),
+        num_voters, max_results, num_threads);
+    for (size_t i = 0; i < results.size(); i++) {
+        std::copy(results[i].first.begin(), results[i].first.end(),
+                  new_approvalwise_vectors + i * num_candidates);
+        distances[i] = results[i].second;
+    }
+    return results.size();
 }
 
 int32_t pairs_binding(int32_t* approvalwise_vectors, int32_t num_voters,
                       int32_t num_candidates, int32_t num_instances,
-                      int32_t* new_approvalwise_vector) {
+                      int32_t num_threads, int32_t* new_approvalwise_vector) {
+    auto algorithm = [&](const std::vector<approvalwise_vector_t>& vectors,
+                         const int num_voters) {
+        return pairs::farthest_approvalwise_vector(vectors, num_voters,
+                                                   num_threads);
+    };
     return __create_biding(approvalwise_vectors, num_voters, num_candidates,
-                           num_instances, new_approvalwise_vector,
-                           pairs::farthest_approvalwise_vector);
+                           num_instances, new_approvalwise_vector, algorithm);
+}
+
+int32_t pairs_knn_binding(int32_t* approvalwise_vectors, int32_t num_voters,
+                          int32_t num_candidates, int32_t num_instances,
+                          int32_t k, int32_t num_threads,
+                          int32_t* new_approvalwise_vector) {
+    auto algorithm = [&](const std::vector<approvalwise_vector_t>& vectors,
+                         const int num_voters) {
+        return pairs::farthest_approvalwise_vector_knn(vectors, num_voters, k,
+                                                       num_threads);
+    };
+    return __create_biding(approvalwise_vectors, num_voters, num_candidates,
+                           num_instances, new_approvalwise_vector, algorithm);
+}
+
+void* pairs_session_create(int32_t num_voters, int32_t num_candidates) {
+    return new pairs::Session(num_voters, num_candidates);
+}
+
+void pairs_session_add(void* session, int32_t* approvalwise_vectors,
+                       int32_t num_candidates, int32_t num_instances) {
+    for (const auto& approvalwise_vector : __load_vectors(
+             approvalwise_vectors, num_candidates, num_instances)) {
+        static_cast<pairs::Session*>(session)->add(approvalwise_vector);
+    }
+}
+
+int32_t pairs_session_farthest(void* session,
+                               int32_t* new_approvalwise_vector) {
+    auto [result_vec, result_dist] =
+        static_cast<pairs::Session*>(session)->farthest();
+    std::copy(result_vec.begin(), result_vec.end(), new_approvalwise_vector);
+    return result_dist;
+}
+
+void pairs_session_free(void* session) {
+    delete static_cast<pairs::Session*>(session);
+}
+
+void* vector_set_create(int32_t* approvalwise_vectors, int32_t num_voters,
+                        int32_t num_candidates, int32_t num_instances) {
+    auto vectors =
+        __load_vectors(approvalwise_vectors, num_candidates, num_instances);
+    ReferenceMatrix references(num_candidates);
+    for (const auto& vector : vectors) {
+        references.append(vector);
+    }
+    return new NativeVectorSet{num_voters, num_candidates, std::move(vectors),
+                               std::move(references)};
+}
+
+void vector_set_append(void* vector_set, int32_t* approvalwise_vectors,
+                       int32_t num_instances) {
+    auto& set = *static_cast<NativeVectorSet*>(vector_set);
+    for (int32_t i = 0; i < num_instances; i++) {
+        set.vectors.emplace_back(
+            approvalwise_vectors + i * set.num_candidates,
+            approvalwise_vectors + (i + 1) * set.num_candidates);
+        set.references.append(set.vectors.back());
+    }
+}
+
+int32_t vector_set_size(void* vector_set) {
+    return static_cast<NativeVectorSet*>(vector_set)->vectors.size();
+}
+
+void vector_set_free(void* vector_set) {
+    delete static_cast<NativeVectorSet*>(vector_set);
+}
+
+int32_t greedy_dp_vector_set_binding(void* vector_set, int32_t num_threads,
+                                     int32_t* new_approvalwise_vector) {
+    auto algorithm = [&](const NativeVectorSet& set) {
+        return greedy_dp::farthest_approvalwise_vector(
+            set.references, set.num_voters, num_threads);
+    };
+    return __vector_set_binding(vector_set, new_approvalwise_vector,
+                                algorithm);
+}
+
+int32_t pairs_vector_set_binding(void* vector_set, int32_t num_threads,
+                                 int32_t* new_approvalwise_vector) {
+    auto algorithm = [&](const NativeVectorSet& set) {
+        return pairs::farthest_approvalwise_vector(
+            set.vectors, set.references, set.num_voters, num_threads);
+    };
+    return __vector_set_binding(vector_set, new_approvalwise_vector,
+                                algorithm);
+}
+
+int32_t basin_hopping_binding(int32_t* approvalwise_vectors, int32_t num_voters,
+                              int32_t num_candidates, int32_t num_instances,
+                              int32_t* x0, int64_t niter, int32_t step_size,
+                              double big_step_chance, uint64_t seed,
+                              int32_t* new_approvalwise_vector) {
+    auto algorithm = [&](const std::vector<approvalwise_vector_t>& vectors,
+                         const int num_voters) {
+        return basin_hopping::farthest_approvalwise_vector(
+            vectors, num_voters, approvalwise_vector_t(x0, x0 + num_candidates),
+            niter, step_size, big_step_chance, seed);
+    };
+    return __create_biding(approvalwise_vectors, num_voters, num_candidates,
+                           num_instances, new_approvalwise_vector, algorithm);
+}
 }
-}
\ No newline at end of file
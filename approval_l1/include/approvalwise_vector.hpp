@@ -12,9 +12,34 @@ void save_approvalwise_vectors(std::ostream& out,
                                const vector<approvalwise_vector_t>& vectors,
                                const size_t num_voters);
 
+// Reference vectors stored candidate-major in one contiguous buffer, so loops
+// over references for a fixed candidate read consecutive ints and can be
+// auto-vectorized. Every column has room for `capacity` references, so
+// appending a reference is amortized O(num_candidates).
+struct ReferenceMatrix {
+    int num_references;
+    int num_candidates;
+    int capacity;
+    vi data;
+
+    explicit ReferenceMatrix(const int num_candidates);
+    explicit ReferenceMatrix(
+        const vector<approvalwise_vector_t>& approvalwise_vectors);
+
+    void append(const approvalwise_vector_t& approvalwise_vector);
+
+    // Values of candidate `x` in every reference.
+    const int* column(const int x) const { return &data[x * capacity]; }
+};
+
 int dist_l1(const approvalwise_vector_t& a, const approvalwise_vector_t& b);
 
 int score_across(const vector<approvalwise_vector_t>& votings_hist,
                  const approvalwise_vector_t& voting, const int num_voters);
 
+// Callers scoring many vectors against the same references build the matrix
+// once and use this overload.
+int score_across(const ReferenceMatrix& references,
+                 const approvalwise_vector_t& voting, const int num_voters);
+
 void print_vec(const vector<int>& v);
\ No newline at end of file
@@ -0,0 +1,13 @@
+#pragma once
+
+#include <cstdint>
+#include <vector>
+
+#include "definitions.hpp"
+
+namespace basin_hopping {
+pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
+    const vector<approvalwise_vector_t>& approvalwise_vectors,
+    const int num_voters, const approvalwise_vector_t& x0, const long long niter,
+    const int step_size, const double big_step_chance, const uint64_t seed);
+}  // namespace basin_hopping
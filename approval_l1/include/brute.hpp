@@ -4,6 +4,11 @@
 #include "utils.hpp"
 
 namespace brute {
+// Exact farthest approvalwise vector. A DP over the same grid as greedy_dp
+// which keeps, instead of a single best prefix per cell, all prefixes whose
+// distances to the references are not dominated by another prefix, pruned
+// against the greedy_dp vector. Exponential in the worst case, meant for
+// small instances.
 pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
     const vector<approvalwise_vector_t>& votings_hist, const int N);
 }  // namespace brute
@@ -4,9 +4,27 @@
 #include <iostream>
 #include <vector>
 
+#include "approvalwise_vector.hpp"
 #include "definitions.hpp"
 
 namespace greedy_dp {
+// `num_threads` threads share every column, where 0 means all available cores.
 pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
-    const vector<approvalwise_vector_t>& votings_hist, const int N);
+    const vector<approvalwise_vector_t>& votings_hist, const int N,
+    int num_threads = 0);
+
+// Backtracked vectors of the same DP for up to `max_results` terminal
+// heights, with their distances, farthest first. The first one is the result
+// of `farthest_approvalwise_vector`.
+vector<pair<approvalwise_vector_t, int>> farthest_approvalwise_vectors(
+    const vector<approvalwise_vector_t>& votings_hist, const int N,
+    const int max_results, int num_threads = 0);
+
+// The same on references already laid out in a matrix, e.g. kept between
+// calls of a sequential run.
+pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
+    const ReferenceMatrix& references, const int N, int num_threads = 0);
+vector<pair<approvalwise_vector_t, int>> farthest_approvalwise_vectors(
+    const ReferenceMatrix& references, const int N, const int max_results,
+    int num_threads = 0);
 }
\ No newline at end of file
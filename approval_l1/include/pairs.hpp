@@ -4,10 +4,55 @@
 #include <iostream>
 #include <vector>
 
+#include "approvalwise_vector.hpp"
 #include "definitions.hpp"
 
 namespace pairs {
+// Pairs are split across `num_threads` threads, where 0 means all available
+// cores. Ties are broken by pair index, independently of `num_threads`.
 pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
     const vector<approvalwise_vector_t>& approvalwise_vectors,
-    const int num_voters);
+    const int num_voters, const int num_threads = 0);
+// The same with `references` already laid out from `approvalwise_vectors`.
+pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
+    const vector<approvalwise_vector_t>& approvalwise_vectors,
+    const ReferenceMatrix& references, const int num_voters,
+    const int num_threads = 0);
+
+// Pairs restricted to every reference joined with its `k` nearest and `k`
+// farthest references in L1 (ties by index), i.e. O(R * k) two-vector solves
+// instead of O(R^2). Far pairs are kept because once extreme vectors are
+// references, near pairs alone return only existing references. Falls back to
+// the full pairs when every solved pair does, and for `k >= R - 1` the result
+// is the same as of the full pairs.
+pair<approvalwise_vector_t, int> farthest_approvalwise_vector_knn(
+    const vector<approvalwise_vector_t>& approvalwise_vectors,
+    const int num_voters, const int k, const int num_threads = 0);
+
+// Pairs heuristic for sequential runs, where references are only appended.
+// Candidates of all pairs are cached with their running distances to the
+// references, so adding the R-th reference costs R two-vector solves on the
+// new pairs and O(cached * M) to rescore, instead of recomputing everything.
+// `farthest` returns the same result as `farthest_approvalwise_vector` on
+// all added references, ties included.
+class Session {
+   public:
+    Session(const int num_voters, const int num_candidates);
+
+    void add(const approvalwise_vector_t& approvalwise_vector);
+    pair<approvalwise_vector_t, int> farthest() const;
+    size_t size() const { return references.size(); }
+
+   private:
+    int num_voters;
+    int num_candidates;
+    vector<approvalwise_vector_t> references;
+    // the same references candidate-major, to score the new candidates
+    ReferenceMatrix matrix;
+    // candidate of pair (first[i], second[i]) is row i of `candidates`
+    vi candidates;
+    vi distances;
+    vi first;
+    vi second;
+};
 }
\ No newline at end of file
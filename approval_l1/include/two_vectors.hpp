@@ -0,0 +1,14 @@
+#pragma once
+
+#include <vector>
+
+#include "definitions.hpp"
+
+namespace two_vectors {
+// Farthest approvalwise vector from exactly two references, equal to
+// `greedy_dp::farthest_approvalwise_vector({first, second}, num_voters)`
+// including ties, in O(M * N log N) time and O(M * N) memory.
+pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
+    const approvalwise_vector_t& first, const approvalwise_vector_t& second,
+    const int num_voters);
+}  // namespace two_vectors
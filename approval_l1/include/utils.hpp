@@ -1,3 +1,54 @@
 #pragma once
 
+#include <algorithm>
+#include <atomic>
+#include <thread>
+#include <vector>
+
 #include "definitions.hpp"
+
+// Resolves a requested number of threads, where 0 means all available cores.
+inline int resolve_num_threads(const int num_threads) {
+    if (num_threads > 0) {
+        return num_threads;
+    }
+    return max(1u, thread::hardware_concurrency());
+}
+
+// Calls `body(i)` for every i in [begin, end) on up to `num_threads` threads
+// (0 means all available cores). Indices are handed out in chunks of
+// `chunk_size` on demand, so iterations of uneven cost stay balanced. Runs
+// serially on the calling thread when a single thread is requested.
+template <typename Body>
+void parallel_for(const int begin, const int end, int num_threads,
+                  const Body& body, const int chunk_size = 1) {
+    num_threads = min(resolve_num_threads(num_threads),
+                      max(1, (end - begin + chunk_size - 1) / chunk_size));
+    if (num_threads <= 1) {
+        for (int i = begin; i < end; i++) {
+            body(i);
+        }
+        return;
+    }
+
+    atomic<int> next(begin);
+    const auto worker = [&]() {
+        for (int lo = next.fetch_add(chunk_size); lo < end;
+             lo = next.fetch_add(chunk_size)) {
+            const int hi = min(end, lo + chunk_size);
+            for (int i = lo; i < hi; i++) {
+                body(i);
+            }
+        }
+    };
+
+    vector<thread> threads;
+    threads.reserve(num_threads - 1);
+    for (int t = 1; t < num_threads; t++) {
+        threads.emplace_back(worker);
+    }
+    worker();
+    for (auto& thread : threads) {
+        thread.join();
+    }
+}
@@ -0,0 +1,78 @@
+import argparse
+import os
+import time
+
+import pandas as pd
+from scripts.approvalwise_vector import load_from_text_file
+from scripts.bindings import pairs, pairs_knn
+
+parser = argparse.ArgumentParser(
+    description='Compare pairs restricted to the kNN graph of references with the full pairs in space filling runs')
+parser.add_argument('--experiments', type=str, nargs='+',
+                    default=['20x50', '30x60'], help='Experiment IDs, i.e. <num_candidates>x<num_voters>')
+parser.add_argument('--families', type=str, nargs='+',
+                    default=['noise', 'truncated_urn', 'euclidean', 'resampling'], help='Family IDs')
+parser.add_argument('--k', type=int, nargs='+',
+                    default=[2, 4, 8, 16], help='Numbers of nearest neighbours')
+parser.add_argument('--steps', type=int, default=20,
+                    help='Number of space filling steps')
+
+args = parser.parse_args()
+
+report_rows = []
+for experiment_id in args.experiments:
+    for family_id in args.families:
+        elections_path = os.path.join(
+            'experiments', experiment_id, family_id, 'elections.txt')
+        if not os.path.exists(elections_path):
+            print(f'Skipping {experiment_id} {family_id}, no {elections_path}')
+            continue
+        with open(elections_path, 'r') as file:
+            approvalwise_vectors = list(load_from_text_file(file).values())
+
+        print(f'Comparing pairs_knn with pairs for {experiment_id} {family_id}')
+        # the run follows the full pairs, so every step compares both on the same references
+        for step in range(args.steps):
+            start_time = time.time()
+            vector, distance = pairs(approvalwise_vectors)
+            pairs_time = time.time() - start_time
+
+            for k in args.k:
+                start_time = time.time()
+                knn_vector, knn_distance = pairs_knn(approvalwise_vectors, k=k)
+                report_rows.append({
+                    'experiment_id': experiment_id,
+                    'family_id': family_id,
+                    'step': step,
+                    'num_references': len(approvalwise_vectors),
+                    'k': k,
+                    'distance': distance,
+                    'knn_distance': knn_distance,
+                    'same_distance': knn_distance == distance,
+                    'same_vector': bool((knn_vector == vector).all()),
+                    'time': pairs_time,
+                    'knn_time': time.time() - start_time,
+                })
+
+            approvalwise_vectors.append(vector)
+
+if not report_rows:
+    raise SystemExit('No experiments found')
+
+report = pd.DataFrame(report_rows)
+results_dir = os.path.join('results', 'pairs_knn')
+os.makedirs(results_dir, exist_ok=True)
+report.to_csv(os.path.join(results_dir, 'pairs_knn_report.csv'), index=False)
+
+summary = report.groupby(['experiment_id', 'k']).agg(
+    match_rate=('same_distance', 'mean'),
+    same_vector_rate=('same_vector', 'mean'),
+    mean_gap=('distance', 'mean'),
+    time=('time', 'mean'),
+    knn_time=('knn_time', 'mean'),
+)
+summary['mean_gap'] -= report.groupby(['experiment_id', 'k'])['knn_distance'].mean()
+summary['speedup'] = summary['time'] / summary['knn_time']
+summary = summary.drop(columns=['time', 'knn_time'])
+summary.to_csv(os.path.join(results_dir, 'pairs_knn_summary.csv'))
+print(summary.to_string())
@@ -2,12 +2,13 @@
 
 from typing import Callable
 
-from scripts.approvalwise_vector import ApprovalwiseVector
-from scripts.basin_hopping import basin_hopping
+from scripts.approvalwise_vector import ApprovalwiseVector, ApprovalwiseVectorSet
+from scripts.basin_hopping import BasinHoppingSession, basin_hopping, basin_hopping_native, basin_hopping_parallel
 from scripts.gurobi import gurobi_ilp
+from scripts.parallel_tempering import parallel_tempering
 
 
-Algorithm = Callable[[list[ApprovalwiseVector]],
+Algorithm = Callable[[list[ApprovalwiseVector] | ApprovalwiseVectorSet],
                      tuple[ApprovalwiseVector, int]]
 
 
@@ -31,13 +32,67 @@ def _basin_hopping_random(approvalwise_vectors, **kwargs):
     )
 
 
+def _basin_hopping_adaptive(approvalwise_vectors, **kwargs):
+    return basin_hopping(
+        approvalwise_vectors=approvalwise_vectors,
+        step_size=7,
+        big_step_chance=0.2,
+        x0='mix',
+        adaptive=True,
+        **kwargs
+    )
+
+
+def _basin_hopping_native(approvalwise_vectors, **kwargs):
+    return basin_hopping_native(
+        approvalwise_vectors=approvalwise_vectors,
+        step_size=7,
+        big_step_chance=0.2,
+        x0='mix',
+        **kwargs
+    )
+
+
+def _basin_hopping_parallel(approvalwise_vectors, **kwargs):
+    vector, distance, _chains = basin_hopping_parallel(
+        approvalwise_vectors=approvalwise_vectors,
+        step_size=7,
+        big_step_chance=0.2,
+        **kwargs
+    )
+    return vector, distance
+
+
+def _parallel_tempering(approvalwise_vectors, **kwargs):
+    return parallel_tempering(
+        approvalwise_vectors=approvalwise_vectors,
+        step_size=7,
+        big_step_chance=0.2,
+        **kwargs
+    )
+
+
+def _gurobi_greedy_dp_starts(approvalwise_vectors, **kwargs):
+    from scripts.bindings import greedy_dp_candidates
+
+    starts = [vector for vector, _distance in greedy_dp_candidates(
+        approvalwise_vectors, k=8)]
+    return gurobi_ilp(approvalwise_vectors, x0=starts, **kwargs)
+
+
 try:
-    from scripts.bindings import greedy_dp, pairs
+    from scripts.bindings import brute, greedy_dp, pairs
 
     algorithms = {
         'basin_hopping': _basin_hopping_step,
         'basin_hopping_random': _basin_hopping_random,
+        'basin_hopping_adaptive': _basin_hopping_adaptive,
+        'basin_hopping_native': _basin_hopping_native,
+        'basin_hopping_parallel': _basin_hopping_parallel,
+        'parallel_tempering': _parallel_tempering,
         'gurobi': gurobi_ilp,
+        'gurobi_greedy_dp_starts': _gurobi_greedy_dp_starts,
+        'brute': brute,
         'greedy_dp': greedy_dp,
         'pairs': pairs
     }
@@ -45,5 +100,30 @@ except Exception as e:
     algorithms = {
         'basin_hopping': _basin_hopping_step,
         'basin_hopping_random': _basin_hopping_random,
+        'basin_hopping_adaptive': _basin_hopping_adaptive,
+        'basin_hopping_parallel': _basin_hopping_parallel,
+        'parallel_tempering': _parallel_tempering,
         'gurobi': gurobi_ilp,
     }
+
+# Factories of stateful algorithms for sequential runs, one instance per sequence. An instance is called like
+# an `Algorithm` and may reuse work from previous calls of the same sequence.
+sessions: dict[str, Callable[[], Algorithm]] = {
+    'basin_hopping_warm': lambda: BasinHoppingSession(step_size=7, big_step_chance=0.2, x0='mix'),
+}
+
+try:
+    from scripts.bindings import NativeSession, PairsSession, greedy_dp, pairs
+
+    sessions['greedy_dp_native'] = lambda: NativeSession(greedy_dp)
+    sessions['pairs_native'] = lambda: NativeSession(pairs)
+    sessions['pairs_incremental'] = PairsSession
+except Exception as e:
+    pass
+
+
+def get_algorithm(algorithm_id: str) -> Algorithm:
+    """Returns a fresh session for `algorithm_id` if it is stateful, and the algorithm itself otherwise."""
+    if algorithm_id in sessions:
+        return sessions[algorithm_id]()
+    return algorithms[algorithm_id]
@@ -7,7 +7,7 @@ import numpy as np
 class ApprovalwiseVector(np.ndarray):
     def __new__(cls, approvalwise_vector: np.ndarray | Iterable[int], num_voters: int):
         obj = np.asarray(approvalwise_vector).view(cls)
-        if any(obj[1:] > obj[:-1]):
+        if np.any(obj[1:] > obj[:-1]):
             raise ValueError(
                 f'Approvalwise vector must be sorted in non increasing order {obj}')
         obj.num_voters = num_voters
@@ -18,6 +18,102 @@ class ApprovalwiseVector(np.ndarray):
         return len(self)
 
 
+class ApprovalwiseVectorSet:
+    """# Summary
+    Growable collection of approvalwise vectors sharing `num_voters` and `num_candidates`, stored in one
+    preallocated 2-D buffer.
+
+    Appending is amortized O(`num_candidates`), indexing returns zero-copy `ApprovalwiseVector` row views and
+    `np.asarray` on the set returns a view of all rows, so algorithms get a contiguous array without stacking
+    vectors on every call. Batches are validated with a single vectorized monotonicity check.
+
+    ## Args:
+        `num_voters` (int): Number of voters of every election in the set.
+        `num_candidates` (int): Number of candidates of every election in the set.
+        `approvalwise_vectors` (Iterable[ApprovalwiseVector], optional): Initial vectors. Defaults to `()`.
+        `dtype` (np.dtype, optional): Buffer type, `np.int32` matches native bindings. Defaults to `np.int32`.
+        `capacity` (int, optional): Initial number of preallocated rows. Defaults to `16`.
+    """
+
+    def __init__(self, num_voters: int, num_candidates: int, approvalwise_vectors: Iterable[ApprovalwiseVector] = (),
+                 dtype=np.int32, capacity: int = 16):
+        self.num_voters = num_voters
+        self._size = 0
+        self._data = np.zeros((max(capacity, 1), num_candidates), dtype=dtype)
+        self.extend(approvalwise_vectors)
+
+    @classmethod
+    def from_vectors(cls, approvalwise_vectors: list[ApprovalwiseVector], **kwargs) -> 'ApprovalwiseVectorSet':
+        sample = approvalwise_vectors[0]
+        return cls(sample.num_voters, sample.num_candidates, approvalwise_vectors,
+                   capacity=len(approvalwise_vectors), **kwargs)
+
+    @classmethod
+    def wrap(cls, array: np.ndarray, num_voters: int) -> 'ApprovalwiseVectorSet':
+        """Creates a set viewing `array` without copying or validating it. The first append copies the rows into
+        a new buffer, so `array` may be read-only, e.g. backed by shared memory."""
+        approvalwise_vector_set = cls(num_voters, array.shape[1], capacity=1)
+        approvalwise_vector_set._data = array
+        approvalwise_vector_set._size = len(array)
+        return approvalwise_vector_set
+
+    @property
+    def num_candidates(self) -> int:
+        return self._data.shape[1]
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._data[:self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __array__(self, dtype=None):
+        return self.array if dtype is None else self.array.astype(dtype, copy=False)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return ApprovalwiseVectorSet(self.num_voters, self.num_candidates, self.array[idx], dtype=self._data.dtype)
+        row = self.array[idx].view(ApprovalwiseVector)
+        row.num_voters = self.num_voters
+        return row
+
+    def __iter__(self):
+        for idx in range(self._size):
+            yield self[idx]
+
+    def copy(self) -> 'ApprovalwiseVectorSet':
+        return self[:]
+
+    def _reserve(self, size: int) -> None:
+        if size <= len(self._data):
+            return
+        capacity = max(size, 2 * len(self._data))
+        data = np.zeros((capacity, self.num_candidates), dtype=self._data.dtype)
+        data[:self._size] = self.array
+        self._data = data
+
+    def append(self, approvalwise_vector: ApprovalwiseVector | Iterable[int]) -> None:
+        self.extend(np.asarray(approvalwise_vector).reshape(1, -1))
+
+    def extend(self, approvalwise_vectors: Iterable[ApprovalwiseVector] | np.ndarray) -> None:
+        if not isinstance(approvalwise_vectors, np.ndarray):
+            approvalwise_vectors = list(approvalwise_vectors)
+            if not approvalwise_vectors:
+                return
+        batch = np.asarray(approvalwise_vectors).reshape(-1, self.num_candidates)
+        if np.any(batch[:, 1:] > batch[:, :-1]):
+            raise ValueError(
+                'Approvalwise vectors must be sorted in non increasing order')
+        if np.any(batch < 0) or np.any(batch > self.num_voters):
+            raise ValueError(
+                f'Approvalwise vectors must be in range [0, {self.num_voters}]')
+
+        self._reserve(self._size + len(batch))
+        self._data[self._size:self._size + len(batch)] = batch
+        self._size += len(batch)
+
+
 def get_approvalwise_vector(election: mapel.ApprovalElection) -> ApprovalwiseVector:
     vector = np.zeros(election.num_candidates, dtype=int)
     for vote in election.votes:
@@ -1,13 +1,18 @@
 import argparse
 import math
+import os
 import time
-from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Optional
 
 import numpy as np
 from scipy.optimize import basinhopping
-from scripts.approvalwise_vector import ApprovalwiseVector, uniform_approvalwise_vector
-from scripts.bindings import greedy_dp
-from scripts.distances import l1_across
+from scripts.approvalwise_vector import ApprovalwiseVector, ApprovalwiseVectorSet, uniform_approvalwise_vector
+from scripts.bindings import basin_hopping_engine, greedy_dp, greedy_dp_candidates
+from scripts.distances import l1_shift_delta, l1_unit_step_delta
+from scripts.lattice_search import LatticeSearch, LocalOptima, StepTuner, StoppingCriteria
 from scripts.sampling_methods import (
     find_best_starting_step_vector,
     find_best_vector,
@@ -16,11 +21,18 @@ from scripts.sampling_methods import (
 )
 
 
+# Threads of native x0 heuristics, 0 meaning all cores. Pool workers of `basin_hopping_parallel` set it to 1, as
+# the chains already use every core.
+_x0_num_threads = 0
+
+
 def __to_int(x):
     return np.round_(x).astype(np.int32)
 
 
 def __select_x0(x0, approvalwise_vectors, num_voters, num_candidates, rng):
+    if isinstance(x0, np.ndarray):
+        return np.array(x0)
     match x0:
         case (x0, num_start):
             x0, num_start = x0, num_start
@@ -46,19 +58,41 @@ def __select_x0(x0, approvalwise_vectors, num_voters, num_candidates, rng):
             num_voters, num_candidates, tries=num_start, rng=rng)
         return find_best_starting_step_vector(approvalwise_vectors, candidates)
     elif x0 == 'greedy_dp':
-        return greedy_dp(approvalwise_vectors)[0]
+        return greedy_dp(approvalwise_vectors, num_threads=_x0_num_threads)[0]
+    elif x0 == 'greedy_dp_candidates':
+        candidates = [vector for vector, _distance in greedy_dp_candidates(
+            approvalwise_vectors, k=num_start, num_threads=_x0_num_threads)]
+        return find_best_starting_step_vector(approvalwise_vectors, candidates)
     else:
         return np.array(x0)
 
 
+def __default_niter(num_voters, num_candidates, step_size, big_step_chance):
+    niter = num_candidates * num_voters / \
+        (2 * 0.05 * (step_size / 2 * (1 - big_step_chance) +
+         num_candidates * big_step_chance))
+    return max(round(niter), 1000)
+
+
 def basin_hopping(
-    approvalwise_vectors: list[ApprovalwiseVector],
+    approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet,
     niter: int | None = None,
     step_size: int = 1,
     seed: Optional[int] = None,
     big_step_chance: float = 0.0,
-    x0: str | ApprovalwiseVector = 'random'
-) -> tuple[ApprovalwiseVector, int]:
+    x0: str | ApprovalwiseVector = 'random',
+    engine: str = 'scipy',
+    patience: int | None = None,
+    target_distance: int | None = None,
+    time_budget: float | None = None,
+    adaptive: bool = False,
+    x0_pool: np.ndarray | None = None,
+    on_accept: Callable[[np.ndarray, int], None] | None = None,
+    top_k: int | None = None,
+    min_separation: int = 1,
+    full_output: bool = False
+) -> tuple[ApprovalwiseVector, int] | tuple[ApprovalwiseVector, int, dict] | list[tuple[ApprovalwiseVector, int]] \
+        | tuple[list[tuple[ApprovalwiseVector, int]], dict]:
     """# Summary
     Basin hopping algorithm for finding farthest approvalwise vector.
 
@@ -67,15 +101,37 @@ def basin_hopping(
     Big step is defined as a difference of +1 or -1 on a prefix/suffix of the vector, such that monotonicity is preserved.
 
     ## Args:
-        `approvalwise_vectors` (list[VotingHist]): list of approvalwise vectors/elections, where each approvalwise vector is a list of non decreasing integers in range [0, `num_voters`].
+        `approvalwise_vectors` (list[VotingHist] | ApprovalwiseVectorSet): list of approvalwise vectors/elections, where each approvalwise vector is a list of non decreasing integers in range [0, `num_voters`].
         `niter` (int, optional): Number of iterations for Basinhopping algorithm. Defaults to at least `1000`.
         `step_size` (int, optional): For every iteration algorithm can make from 1 to `step_size` unit steps (at random). Defaults to `1`.
         `seed` (Optional[int], optional): Seed of random engine. Defaults to `None`.
         `big_step_chance` (float, optional): Chance of making a big step instead of unit steps. Defaults to `0.0`.
         `x0` (str | VotingHist, optional): Initial point for Basinhopping algorithm. Defaults to `'random'` Possible: 'random', 'random_resampling'.
+        `engine` (str, optional): `'scipy'` runs `scipy.optimize.basinhopping`, `'lattice'` runs `LatticeSearch`, which
+        uses the same moves and acceptance without scipy's continuous local minimizer. Defaults to `'scipy'`.
+        `patience` (int, optional): Stop after this many iterations without improving the best distance. Defaults to `None`.
+        `target_distance` (int, optional): Stop once the best distance reaches this value, e.g. the previous distance
+        in a sequential run, which bounds the next one from above. Defaults to `None`.
+        `time_budget` (float, optional): Stop after this many seconds. Defaults to `None`.
+        `adaptive` (bool, optional): Treat `step_size` and `big_step_chance` as initial values and tune them online
+        with `StepTuner`. Defaults to `False`.
+        `x0_pool` (np.ndarray, optional): Additional starting candidates, e.g. optima of previous runs. The run
+        starts from the farthest of `x0` and these. Defaults to `None`.
+        `on_accept` (Callable[[np.ndarray, int], None], optional): Called with every accepted state and its distance,
+        e.g. to collect local optima. The state must be copied to be kept. Defaults to `None`.
+        `top_k` (int, optional): Return up to `top_k` farthest distinct accepted states instead of only the best one,
+        e.g. as a candidate pool for Gurobi MIP starts. Defaults to `None`.
+        `min_separation` (int, optional): Minimum L1 distance between any two states returned with `top_k`.
+        Defaults to `1`.
+        `full_output` (bool, optional): Return also a dictionary with `stop_reason` (`'niter'`, `'patience'`,
+        `'target_distance'` or `'time_budget'`), number of iterations `nit` and objective evaluations `nfev`, and
+        with `adaptive` also the tuning `trajectory`. Defaults to `False`.
 
     ## Returns:
         -> (VotingHist, int): Farthest approvalwise vector and its distance from given approvalwise vectors.
+        -> (VotingHist, int, dict): The same with run statistics, if `full_output` is set.
+        -> list[(VotingHist, int)]: With `top_k`, the farthest accepted states with their distances, farthest first.
+        -> (list[(VotingHist, int)], dict): The same with run statistics, if `full_output` is set.
 
     ## Examples
     """
@@ -85,60 +141,363 @@ def basin_hopping(
     rng = np.random.default_rng(seed)
     x0_vector: np.ndarray = __select_x0(
         x0, approvalwise_vectors, num_voters, num_candidates, rng)
+    if x0_pool is not None and len(x0_pool):
+        x0_vector = find_best_vector(approvalwise_vectors, np.concatenate(
+            [np.asarray(x0_vector).reshape(1, -1), x0_pool]))
     x0_vector = np.concatenate([x0_vector, np.array([0, num_voters])])
 
-    approvalwise_vectors = np.array(approvalwise_vectors)
+    approvalwise_vectors = np.asarray(approvalwise_vectors)
     if niter is None:
-        niter = num_candidates * num_voters / \
-            (2 * 0.05 * (step_size / 2 * (1 - big_step_chance) +
-             num_candidates * big_step_chance))
-        niter = max(round(niter), 1000)
+        niter = __default_niter(
+            num_voters, num_candidates, step_size, big_step_chance)
+
+    stopping = StoppingCriteria(patience, target_distance, time_budget)
+    tuner = StepTuner(step_size, big_step_chance,
+                      max_step_size=num_candidates) if adaptive else None
+
+    optima = LocalOptima(num_candidates, capacity=64 *
+                         top_k) if top_k is not None else None
+    if optima is not None:
+        user_on_accept = on_accept
+
+        def on_accept(x, distance):
+            optima(x, distance)
+            if user_on_accept is not None:
+                user_on_accept(x, distance)
+
+    def result(x, distance, nit, nfev):
+        info = {'stop_reason': stopping.reason, 'nit': nit, 'nfev': nfev}
+        if tuner is not None:
+            info['trajectory'] = tuner.trajectory
+
+        if optima is not None:
+            optima(x, distance)
+            vectors, distances = optima.diverse(top_k, min_separation)
+            output = [(ApprovalwiseVector(np.array(vector, dtype=int), num_voters), int(distance))
+                      for vector, distance in zip(vectors, distances)]
+            return (output, info) if full_output else output
+
+        vector = ApprovalwiseVector(np.array(x, dtype=int), num_voters)
+        return (vector, distance, info) if full_output else (vector, distance)
+
+    if engine == 'lattice':
+        search = LatticeSearch(approvalwise_vectors,
+                               num_voters, x0_vector[:-2], rng)
+        x, distance = search.run(
+            niter, step_size, big_step_chance, stopping=stopping, tuner=tuner, on_accept=on_accept)
+        return result(x, distance, search.nit, search.nfev)
+    elif engine != 'scipy':
+        raise ValueError(f'Unknown basin hopping engine: {engine}')
+
+    # Distances to every reference are kept for the current and the latest proposed states, so a proposal is
+    # evaluated from the step delta in O(R) per unit step and O(R * shifted length) per big step, and repeated
+    # minimizer calls on the same lattice point are lookups.
+    cached_distances: OrderedDict[bytes, np.ndarray] = OrderedDict()
+
+    def remember(x, distances):
+        cached_distances[x[:-2].tobytes()] = distances
+        if len(cached_distances) > 4:
+            cached_distances.popitem(last=False)
+
+    def distances_to(x):
+        key = x[:-2].tobytes()
+        if key in cached_distances:
+            cached_distances.move_to_end(key)
+            return cached_distances[key]
+        distances = np.sum(np.abs(approvalwise_vectors - x[:-2]), axis=1)
+        remember(x, distances)
+        return distances
 
     def f(x):
-        nonlocal approvalwise_vectors
         x = __to_int(x)
-        d = -l1_across(x[:-2], approvalwise_vectors)
+        d = -int(distances_to(x).min())
         return d
 
-    def unit_step(x):
+    def unit_step(x, distances):
         nonlocal rng, num_candidates
         while True:
             idx = rng.integers(0, num_candidates)
             dx = rng.choice([-1, 1])
             if x[idx - 1] >= x[idx] + dx >= x[idx + 1]:
+                distances = distances + \
+                    l1_unit_step_delta(approvalwise_vectors, x, idx, dx)
                 x[idx] += dx
                 break
-        return x
+        return x, distances
 
-    def big_step(x):
+    def big_step(x, distances):
         nonlocal rng, num_candidates
         while True:
             idx = rng.integers(0, num_candidates)
             dx = rng.choice([-1, 1])
             if dx > 0 and x[idx - 1] >= x[idx] + dx:
+                distances = distances + l1_shift_delta(
+                    approvalwise_vectors, x, idx, num_candidates, dx)
                 x[idx:-2] += dx
                 break
             elif dx < 0 and x[idx] + dx >= x[idx + 1]:
+                distances = distances + l1_shift_delta(
+                    approvalwise_vectors, x, 0, idx + 1, dx)
                 x[:idx + 1] += dx
                 break
-        return x
+        return x, distances
+
+    last_big = False
 
     def step_function(x):
-        nonlocal rng
+        nonlocal rng, last_big
         x = __to_int(x)
+        distances = distances_to(x)
+        if tuner is not None:
+            step_size, big_step_chance = tuner.step_size, tuner.big_step_chance
+        else:
+            step_size, big_step_chance = step_size_, big_step_chance_
 
-        if rng.random() < big_step_chance:
-            return big_step(x)
+        last_big = rng.random() < big_step_chance
+        if last_big:
+            x, distances = big_step(x, distances)
+        else:
+            steps = rng.integers(1, step_size + 1)
+            for _ in range(steps):
+                x, distances = unit_step(x, distances)
 
-        steps = rng.integers(1, step_size + 1)
-        for _ in range(steps):
-            x = unit_step(x)
+        remember(x, distances)
         return x
 
-    res = basinhopping(f, x0_vector, niter=niter,
-                       take_step=step_function, seed=seed)
-    x = __to_int(res.x[:-2])
-    return ApprovalwiseVector(np.array(x, dtype=int), num_voters), -int(res.fun)
+    step_size_, big_step_chance_ = step_size, big_step_chance
+    current_distance = None
+
+    def callback(x, f, accept):
+        nonlocal current_distance
+        if tuner is not None:
+            tuner.record(last_big, accept, -int(f) - current_distance)
+        if accept:
+            current_distance = -int(f)
+            if on_accept is not None:
+                on_accept(__to_int(x[:-2]), current_distance)
+        return stopping.update(-int(f))
+
+    x0_distance = -f(x0_vector)
+    current_distance = x0_distance
+    if on_accept is not None:
+        on_accept(__to_int(x0_vector[:-2]), x0_distance)
+    if stopping.update(x0_distance):
+        x, distance = __to_int(x0_vector[:-2]), x0_distance
+        nit, nfev = 0, 1
+    else:
+        res = basinhopping(f, x0_vector, niter=niter,
+                           take_step=step_function, seed=seed, callback=callback)
+        x, distance = __to_int(res.x[:-2]), -int(res.fun)
+        nit, nfev = res.nit, res.nfev
+
+    return result(x, distance, nit, nfev)
+
+
+def basin_hopping_native(
+    approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet,
+    niter: int | None = None,
+    step_size: int = 1,
+    seed: Optional[int] = None,
+    big_step_chance: float = 0.0,
+    x0: str | ApprovalwiseVector = 'random'
+) -> tuple[ApprovalwiseVector, int]:
+    """# Summary
+    Basin hopping algorithm for finding farthest approvalwise vector, run by the native C++ engine.
+
+    Uses the same unit and big steps, the same Metropolis acceptance (temperature `1`) and the same default
+    `niter` as `basin_hopping`, but skips scipy's local minimizer, which is a no-op for the piecewise constant
+    objective. Random streams differ, so results for a given `seed` differ from `basin_hopping`.
+
+    ## Args:
+        `approvalwise_vectors` (list[VotingHist] | ApprovalwiseVectorSet): list of approvalwise vectors/elections.
+        `niter` (int, optional): Number of iterations. Defaults to the same heuristic as `basin_hopping`.
+        `step_size` (int, optional): For every iteration algorithm can make from 1 to `step_size` unit steps (at random). Defaults to `1`.
+        `seed` (Optional[int], optional): Seed of random engines. Defaults to `None`.
+        `big_step_chance` (float, optional): Chance of making a big step instead of unit steps. Defaults to `0.0`.
+        `x0` (str | VotingHist, optional): Initial point, same options as in `basin_hopping`. Defaults to `'random'`.
+
+    ## Returns:
+        -> (VotingHist, int): Farthest approvalwise vector and its distance from given approvalwise vectors.
+    """
+    num_voters = approvalwise_vectors[0].num_voters
+    num_candidates = approvalwise_vectors[0].num_candidates
+
+    rng = np.random.default_rng(seed)
+    x0_vector: np.ndarray = __select_x0(
+        x0, approvalwise_vectors, num_voters, num_candidates, rng)
+    if niter is None:
+        niter = __default_niter(
+            num_voters, num_candidates, step_size, big_step_chance)
+
+    engine_seed = int(rng.integers(np.iinfo(np.int64).max))
+    return basin_hopping_engine(approvalwise_vectors, x0_vector, niter, step_size, big_step_chance, engine_seed)
+
+
+_shared_memory: shared_memory.SharedMemory | None = None
+_shared_approvalwise_vectors: ApprovalwiseVectorSet | None = None
+
+
+def _attach_approvalwise_vectors(name: str, shape: tuple[int, int], num_voters: int):
+    global _shared_memory, _shared_approvalwise_vectors, _x0_num_threads
+    _x0_num_threads = 1
+    _shared_memory = shared_memory.SharedMemory(name=name)
+    array = np.ndarray(shape, dtype=np.int32, buffer=_shared_memory.buf)
+    array.flags.writeable = False
+    _shared_approvalwise_vectors = ApprovalwiseVectorSet.wrap(
+        array, num_voters)
+
+
+def _check_single_result(kwargs: dict) -> None:
+    # wrappers below unpack a single (vector, distance) result of `basin_hopping`
+    for key, default in [('top_k', None), ('full_output', False)]:
+        if kwargs.get(key, default) != default:
+            raise ValueError(
+                f'`{key}` changes the return value of `basin_hopping` and is not supported here')
+
+
+def _run_chain(chain: int, x0: str, seed: int, kwargs: dict) -> dict:
+    start = time.time()
+    vector, distance = basin_hopping(
+        _shared_approvalwise_vectors, seed=seed, x0=x0, **kwargs)
+    return {
+        'chain': chain,
+        'x0': x0,
+        'seed': seed,
+        'distance': distance,
+        'time': time.time() - start,
+        'vector': vector,
+    }
+
+
+def basin_hopping_parallel(
+    approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet,
+    restarts: int = 8,
+    workers: int | None = None,
+    seed: Optional[int] = None,
+    x0_strategies: tuple[str, ...] = ('random', 'mix', 'uniform', 'greedy_dp'),
+    **kwargs
+) -> tuple[ApprovalwiseVector, int, list[dict]]:
+    """# Summary
+    Runs independent `basin_hopping` chains on a process pool and returns the farthest vector found.
+
+    References are copied once into shared memory, which every worker maps read-only. Chain seeds are spawned
+    from `np.random.SeedSequence(seed)`, so results depend only on `seed` and `restarts`, not on `workers`.
+
+    ## Args:
+        `approvalwise_vectors` (list[VotingHist] | ApprovalwiseVectorSet): list of approvalwise vectors/elections.
+        `restarts` (int, optional): Number of chains. Defaults to `8`.
+        `workers` (int | None, optional): Number of worker processes. Defaults to `os.cpu_count()`.
+        `seed` (Optional[int], optional): Root seed of chain seeds. Defaults to `None`.
+        `x0_strategies` (tuple[str, ...], optional): `x0` of chain `i` is `x0_strategies[i % len(x0_strategies)]`.
+        Defaults to `('random', 'mix', 'uniform', 'greedy_dp')`.
+        `**kwargs`: Passed to every `basin_hopping` chain, e.g. `niter`, `step_size`, `big_step_chance`. `top_k` and
+        `full_output` are rejected with a `ValueError`, as they change the result of a chain.
+
+    ## Returns:
+        -> (VotingHist, int, list[dict]): Farthest approvalwise vector, its distance from given approvalwise
+        vectors and per-chain statistics (`chain`, `x0`, `seed`, `distance`, `time`, `vector`).
+    """
+    _check_single_result(kwargs)
+    num_voters = approvalwise_vectors[0].num_voters
+    array = np.ascontiguousarray(approvalwise_vectors, dtype=np.int32)
+    seeds = [int(child.generate_state(1)[0])
+             for child in np.random.SeedSequence(seed).spawn(restarts)]
+
+    shm = shared_memory.SharedMemory(create=True, size=array.nbytes)
+    try:
+        np.ndarray(array.shape, dtype=np.int32, buffer=shm.buf)[:] = array
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_attach_approvalwise_vectors,
+                                 initargs=(shm.name, array.shape, num_voters)) as executor:
+            futures = [executor.submit(_run_chain, chain, x0_strategies[chain % len(x0_strategies)], chain_seed, kwargs)
+                       for chain, chain_seed in enumerate(seeds)]
+            chains = [future.result() for future in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+
+    best = max(chains, key=lambda chain: chain['distance'])
+    return best['vector'], best['distance'], chains
+
+
+class BasinHoppingSession:
+    """# Summary
+    Stateful `basin_hopping` for sequential runs, where every call gets the previous references plus new ones.
+
+    Accepted states of every run are kept in an elite pool of at most `pool_size` distinct vectors with their
+    distances to the references. On the next call the pool is rescored only against the appended references, in
+    O(pool_size * M) per reference, and the search starts from the best survivor unless a fresh `x0` is farther. The pool is
+    cleared when the references do not extend the previously seen ones, i.e. when the session is reused for another
+    sequence, detected by the length and the last previously seen reference.
+
+    ## Args:
+        `pool_size` (int, optional): Maximum number of kept local optima. Defaults to `32`.
+        `**kwargs`: Arguments of `basin_hopping`, except `top_k` and `full_output`, which are rejected with a
+        `ValueError`.
+
+    ## Examples
+        >>> session = BasinHoppingSession(step_size=7, big_step_chance=0.2, x0='mix')
+        >>> for _ in range(steps):
+        ...     vector, distance = session(approvalwise_vectors)
+        ...     approvalwise_vectors.append(vector)
+    """
+
+    def __init__(self, pool_size: int = 32, **kwargs):
+        _check_single_result(kwargs)
+        self.pool_size = pool_size
+        self.kwargs = kwargs
+        self.reset()
+
+    def reset(self) -> None:
+        self._pool = np.zeros((0, 0), dtype=np.int32)
+        self._pool_distances = np.zeros(0, dtype=np.int64)
+        self._num_references = 0
+        self._last_reference = None
+
+    def __len__(self) -> int:
+        return len(self._pool_distances)
+
+    def _extends_seen(self, references: np.ndarray) -> bool:
+        return len(references) >= self._num_references and (
+            self._last_reference is None or np.array_equal(references[self._num_references - 1], self._last_reference))
+
+    def _rescore(self, references: np.ndarray) -> None:
+        if not self._extends_seen(references):
+            self.reset()
+        if len(self):
+            for reference in references[self._num_references:]:
+                np.minimum(self._pool_distances, np.sum(
+                    np.abs(self._pool - reference), axis=1), out=self._pool_distances)
+        self._num_references = len(references)
+        self._last_reference = references[-1].copy() if len(references) else None
+
+    def _merge(self, optima: LocalOptima) -> None:
+        if not len(optima):
+            return
+        candidates, distances = optima.arrays()
+        pool = np.concatenate([self._pool.reshape(-1, optima.num_candidates), candidates])
+        distances = np.concatenate([self._pool_distances, distances])
+        pool, first = np.unique(pool, axis=0, return_index=True)
+        distances = distances[first]
+        best = np.argsort(-distances, kind='stable')[:self.pool_size]
+        self._pool, self._pool_distances = pool[best], distances[best]
+
+    def __call__(self, approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet,
+                 **kwargs) -> tuple[ApprovalwiseVector, int]:
+        references = np.asarray(approvalwise_vectors)
+        num_candidates = references.shape[1]
+        self._rescore(references)
+
+        kwargs = {**self.kwargs, **kwargs}
+        _check_single_result(kwargs)
+        if len(self):
+            # pool distances are up to date, so only the best survivor is compared with the fresh x0
+            kwargs['x0_pool'] = self._pool[self._pool_distances.argmax()].reshape(1, -1)
+
+        optima = LocalOptima(num_candidates, capacity=2 * self.pool_size)
+        vector, distance = basin_hopping(
+            approvalwise_vectors, on_accept=optima, **kwargs)
+        self._merge(optima)
+        return vector, distance
 
 
 if __name__ == '__main__':
@@ -152,6 +511,8 @@ if __name__ == '__main__':
     parser.add_argument('niter', type=int, help='Number of iterations')
     parser.add_argument('big_step_chance', type=float,
                         help='Chance of big step')
+    parser.add_argument('--engine', type=str, default='scipy',
+                        choices=['scipy', 'lattice'], help='Basin hopping engine')
 
     args = parser.parse_args()
 
@@ -170,7 +531,7 @@ if __name__ == '__main__':
     for i in range(3, num_elections + 3):
         start = time.time()
         x, score = basin_hopping(
-            approvalwise_vectors, niter=niter, step_size=step_size, big_step_chance=big_step_chance)
+            approvalwise_vectors, niter=niter, step_size=step_size, big_step_chance=big_step_chance, engine=args.engine)
         dt = time.time() - start
         print(f'{i},{score},{score/(num_voters*num_candidates):.4f},{dt:.4f}')
         approvalwise_vectors.append(x)
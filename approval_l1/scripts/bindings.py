@@ -1,7 +1,7 @@
 import numpy as np
 import ctypes
 
-from scripts.approvalwise_vector import ApprovalwiseVector
+from scripts.approvalwise_vector import ApprovalwiseVector, ApprovalwiseVectorSet
 
 import os
 import platform
@@ -25,22 +25,144 @@ try:
         raise Exception(f"Unsupported platform: {system}")
 
     # Provide the necessary information about the function to call
+    my_functions.brute_binding.restype = ctypes.c_int
+    my_functions.brute_binding.argtypes = [
+        np.ctypeslib.ndpointer(dtype=np.int32), ctypes.c_int, ctypes.c_int, ctypes.c_int, np.ctypeslib.ndpointer(dtype=np.int32)]
+
     my_functions.greedy_dp_binding.restype = ctypes.c_int
     my_functions.greedy_dp_binding.argtypes = [
-        np.ctypeslib.ndpointer(dtype=np.int32), ctypes.c_int, ctypes.c_int, ctypes.c_int, np.ctypeslib.ndpointer(dtype=np.int32)]
+        np.ctypeslib.ndpointer(dtype=np.int32), ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, np.ctypeslib.ndpointer(dtype=np.int32)]
+
+    my_functions.greedy_dp_candidates_binding.restype = ctypes.c_int
+    my_functions.greedy_dp_candidates_binding.argtypes = [
+        np.ctypeslib.ndpointer(dtype=np.int32), ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+        np.ctypeslib.ndpointer(dtype=np.int32), np.ctypeslib.ndpointer(dtype=np.int32)]
 
     my_functions.pairs_binding.restype = ctypes.c_int
     my_functions.pairs_binding.argtypes = [
-        np.ctypeslib.ndpointer(dtype=np.int32), ctypes.c_int, ctypes.c_int, ctypes.c_int, np.ctypeslib.ndpointer(dtype=np.int32)]
+        np.ctypeslib.ndpointer(dtype=np.int32), ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, np.ctypeslib.ndpointer(dtype=np.int32)]
+
+    my_functions.pairs_knn_binding.restype = ctypes.c_int
+    my_functions.pairs_knn_binding.argtypes = [
+        np.ctypeslib.ndpointer(dtype=np.int32), ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+        np.ctypeslib.ndpointer(dtype=np.int32)]
+
+    my_functions.pairs_session_create.restype = ctypes.c_void_p
+    my_functions.pairs_session_create.argtypes = [ctypes.c_int, ctypes.c_int]
+    my_functions.pairs_session_add.restype = None
+    my_functions.pairs_session_add.argtypes = [
+        ctypes.c_void_p, np.ctypeslib.ndpointer(dtype=np.int32), ctypes.c_int, ctypes.c_int]
+    my_functions.pairs_session_farthest.restype = ctypes.c_int
+    my_functions.pairs_session_farthest.argtypes = [
+        ctypes.c_void_p, np.ctypeslib.ndpointer(dtype=np.int32)]
+    my_functions.pairs_session_free.restype = None
+    my_functions.pairs_session_free.argtypes = [ctypes.c_void_p]
+
+    my_functions.basin_hopping_binding.restype = ctypes.c_int
+    my_functions.basin_hopping_binding.argtypes = [
+        np.ctypeslib.ndpointer(dtype=np.int32), ctypes.c_int, ctypes.c_int, ctypes.c_int, np.ctypeslib.ndpointer(dtype=np.int32),
+        ctypes.c_int64, ctypes.c_int, ctypes.c_double, ctypes.c_uint64, np.ctypeslib.ndpointer(dtype=np.int32)]
+
+    my_functions.vector_set_create.restype = ctypes.c_void_p
+    my_functions.vector_set_create.argtypes = [
+        np.ctypeslib.ndpointer(dtype=np.int32), ctypes.c_int, ctypes.c_int, ctypes.c_int]
+    my_functions.vector_set_append.restype = None
+    my_functions.vector_set_append.argtypes = [
+        ctypes.c_void_p, np.ctypeslib.ndpointer(dtype=np.int32), ctypes.c_int]
+    my_functions.vector_set_size.restype = ctypes.c_int
+    my_functions.vector_set_size.argtypes = [ctypes.c_void_p]
+    my_functions.vector_set_free.restype = None
+    my_functions.vector_set_free.argtypes = [ctypes.c_void_p]
+    my_functions.greedy_dp_vector_set_binding.restype = ctypes.c_int
+    my_functions.greedy_dp_vector_set_binding.argtypes = [
+        ctypes.c_void_p, ctypes.c_int, np.ctypeslib.ndpointer(dtype=np.int32)]
+    my_functions.pairs_vector_set_binding.restype = ctypes.c_int
+    my_functions.pairs_vector_set_binding.argtypes = [
+        ctypes.c_void_p, ctypes.c_int, np.ctypeslib.ndpointer(dtype=np.int32)]
+
+    class NativeVectorSet:
+        """# Summary
+        Reference approvalwise vectors kept in native memory behind an opaque handle.
+
+        Vectors are copied once, on creation or `append`, and `greedy_dp` and `pairs` called with the set run on
+        the native copy directly, without stacking and copying all references on every call.
+
+        ## Args:
+            `approvalwise_vectors` (list[ApprovalwiseVector] | ApprovalwiseVectorSet, optional): Initial vectors.
+            Defaults to `()`.
+            `num_voters` (int | None, optional): Number of voters, required only for an initially empty set.
+            `num_candidates` (int | None, optional): Number of candidates, required only for an initially empty set.
+        """
+
+        def __init__(self, approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet = (),
+                     num_voters: int | None = None, num_candidates: int | None = None):
+            if len(approvalwise_vectors) == 0 and (num_voters is None or num_candidates is None):
+                raise ValueError(
+                    'Cannot infer number of voters and candidates from an empty set')
+            self.num_voters = approvalwise_vectors[0].num_voters if num_voters is None else num_voters
+            self.num_candidates = approvalwise_vectors[0].num_candidates if num_candidates is None else num_candidates
+
+            data = np.ascontiguousarray(approvalwise_vectors, dtype=np.int32).reshape(-1, self.num_candidates)
+            self._handle = my_functions.vector_set_create(
+                data, self.num_voters, self.num_candidates, len(data))
+
+        def __del__(self):
+            if getattr(self, '_handle', None) is not None:
+                my_functions.vector_set_free(self._handle)
+                self._handle = None
+
+        def __len__(self) -> int:
+            return my_functions.vector_set_size(self._handle)
+
+        def append(self, approvalwise_vector: ApprovalwiseVector) -> None:
+            self.extend([approvalwise_vector])
+
+        def extend(self, approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet) -> None:
+            data = np.ascontiguousarray(approvalwise_vectors, dtype=np.int32).reshape(-1, self.num_candidates)
+            my_functions.vector_set_append(self._handle, data, len(data))
+
+        def _run(self, binding, *args) -> tuple[ApprovalwiseVector, int]:
+            output = np.zeros((self.num_candidates,), dtype=np.int32)
+            distance = binding(self._handle, *args, output)
+            return ApprovalwiseVector(output, self.num_voters), distance
+
+    class NativeSession:
+        """# Summary
+        Stateful `algorithm` for sequential runs, which keeps the references in a `NativeVectorSet` and appends
+        only the ones added since the previous call. The set starts over when the references do not extend the ones
+        seen so far, i.e. when they shrink or the last seen reference changed, as when it is reused for another
+        sequence.
+
+        ## Args:
+            `algorithm` (Callable): Binding accepting a `NativeVectorSet`, i.e. `greedy_dp` or `pairs`.
+        """
+
+        def __init__(self, algorithm):
+            self.algorithm = algorithm
+            self._vector_set = None
+            self._last_reference = None
 
-    def __create_binding(approvalwise_vectors: list[ApprovalwiseVector], binding) -> tuple[ApprovalwiseVector, int]:
+        def _extends_seen(self, approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet) -> bool:
+            num_references = len(self._vector_set)
+            return len(approvalwise_vectors) >= num_references and np.array_equal(
+                approvalwise_vectors[num_references - 1], self._last_reference)
+
+        def __call__(self, approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet) -> tuple[ApprovalwiseVector, int]:
+            if self._vector_set is None or not self._extends_seen(approvalwise_vectors):
+                self._vector_set = NativeVectorSet(approvalwise_vectors)
+            elif len(approvalwise_vectors) > len(self._vector_set):
+                self._vector_set.extend(approvalwise_vectors[len(self._vector_set):])
+            self._last_reference = np.array(approvalwise_vectors[-1], dtype=np.int32)
+            return self.algorithm(self._vector_set)
+
+    def __create_binding(approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet, binding) -> tuple[ApprovalwiseVector, int]:
         # Create the output arrays
         num_instances = len(approvalwise_vectors)
         num_candidates = approvalwise_vectors[0].num_candidates
         num_voters = approvalwise_vectors[0].num_voters
 
-        data = np.ascontiguousarray(
-            np.stack([av.data for av in approvalwise_vectors], axis=0).flatten(), dtype=np.int32)
+        # zero-copy for an int32 ApprovalwiseVectorSet, a single stack for a list
+        data = np.ascontiguousarray(approvalwise_vectors, dtype=np.int32)
 
         output = np.zeros((num_candidates,), dtype=np.int32)
 
@@ -50,11 +172,123 @@ try:
         new_approvalwise_vector = ApprovalwiseVector(output, num_voters)
         return new_approvalwise_vector, distance
 
-    def greedy_dp(approvalwise_vectors: list[ApprovalwiseVector]) -> tuple[ApprovalwiseVector, int]:
-        return __create_binding(approvalwise_vectors, my_functions.greedy_dp_binding)
+    def brute(approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet) -> tuple[ApprovalwiseVector, int]:
+        """Exact farthest approvalwise vector from a DP over Pareto-maximal distance labels, for small instances."""
+        return __create_binding(approvalwise_vectors, my_functions.brute_binding)
+
+    def greedy_dp(approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet | NativeVectorSet,
+                  num_threads: int = 0) -> tuple[ApprovalwiseVector, int]:
+        """Runs greedy DP on `num_threads` threads, where 0 means all available cores. Results do not depend on it."""
+        if isinstance(approvalwise_vectors, NativeVectorSet):
+            return approvalwise_vectors._run(my_functions.greedy_dp_vector_set_binding, num_threads)
+
+        def binding(data, num_voters, num_candidates, num_instances, output):
+            return my_functions.greedy_dp_binding(
+                data, num_voters, num_candidates, num_instances, num_threads, output)
+        return __create_binding(approvalwise_vectors, binding)
+
+    def greedy_dp_candidates(approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet, k: int = 16,
+                             num_threads: int = 0) -> list[tuple[ApprovalwiseVector, int]]:
+        """# Summary
+        Runs greedy DP once and backtracks the best vector for up to `k` terminal heights.
+
+        ## Returns:
+            -> list[tuple[ApprovalwiseVector, int]]: Vectors with their distances from given approvalwise vectors,
+            farthest first. The first one is the result of `greedy_dp`.
+        """
+        num_candidates = approvalwise_vectors[0].num_candidates
+        num_voters = approvalwise_vectors[0].num_voters
+        data = np.ascontiguousarray(approvalwise_vectors, dtype=np.int32)
+        k = min(k, num_voters + 1)
+        vectors = np.zeros((k, num_candidates), dtype=np.int32)
+        distances = np.zeros(k, dtype=np.int32)
+        count = my_functions.greedy_dp_candidates_binding(
+            data, num_voters, num_candidates, len(approvalwise_vectors), k, num_threads, vectors, distances)
+        return [(ApprovalwiseVector(vectors[i], num_voters), int(distances[i])) for i in range(count)]
+
+    def pairs(approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet | NativeVectorSet,
+              num_threads: int = 0) -> tuple[ApprovalwiseVector, int]:
+        """Runs pairs on `num_threads` threads, where 0 means all available cores. Results do not depend on it."""
+        if isinstance(approvalwise_vectors, NativeVectorSet):
+            return approvalwise_vectors._run(my_functions.pairs_vector_set_binding, num_threads)
+
+        def binding(data, num_voters, num_candidates, num_instances, output):
+            return my_functions.pairs_binding(
+                data, num_voters, num_candidates, num_instances, num_threads, output)
+        return __create_binding(approvalwise_vectors, binding)
+
+    def pairs_knn(approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet, k: int = 8,
+                  num_threads: int = 0) -> tuple[ApprovalwiseVector, int]:
+        """Runs pairs only on pairs of every reference with its `k` nearest and `k` farthest references in L1, i.e.
+        O(R * k) solves, falling back to full `pairs` when all of them return a reference."""
+        def binding(data, num_voters, num_candidates, num_instances, output):
+            return my_functions.pairs_knn_binding(
+                data, num_voters, num_candidates, num_instances, k, num_threads, output)
+        return __create_binding(approvalwise_vectors, binding)
+
+    class PairsSession:
+        """# Summary
+        Stateful `pairs` for sequential runs, backed by a native session which caches candidates of all pairs with
+        their distances to the references.
+
+        Every call adds only the references appended since the previous call, costing one two-vector solve per new pair and
+        a rescore of cached candidates, and returns the same result as `pairs` on all references. The session starts
+        over when the references do not extend the ones seen so far, i.e. when they shrink or the last seen reference
+        changed, as when it is reused for another sequence.
+        """
+
+        def __init__(self):
+            self._handle = None
+            self._num_references = 0
+            self._last_reference = None
+
+        def reset(self) -> None:
+            if self._handle is not None:
+                my_functions.pairs_session_free(self._handle)
+            self._handle = None
+            self._num_references = 0
+            self._last_reference = None
+
+        def __del__(self):
+            self.reset()
+
+        def __len__(self) -> int:
+            return self._num_references
+
+        def _extends_seen(self, approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet) -> bool:
+            return len(approvalwise_vectors) >= self._num_references and (
+                self._last_reference is None or np.array_equal(
+                    approvalwise_vectors[self._num_references - 1], self._last_reference))
+
+        def __call__(self, approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet) -> tuple[ApprovalwiseVector, int]:
+            num_candidates = approvalwise_vectors[0].num_candidates
+            num_voters = approvalwise_vectors[0].num_voters
+            if not self._extends_seen(approvalwise_vectors):
+                self.reset()
+            if self._handle is None:
+                self._handle = my_functions.pairs_session_create(
+                    num_voters, num_candidates)
+
+            new_vectors = np.ascontiguousarray(
+                approvalwise_vectors[self._num_references:], dtype=np.int32).reshape(-1, num_candidates)
+            my_functions.pairs_session_add(
+                self._handle, new_vectors, num_candidates, len(new_vectors))
+            self._num_references = len(approvalwise_vectors)
+            self._last_reference = np.array(approvalwise_vectors[-1], dtype=np.int32)
+
+            output = np.zeros((num_candidates,), dtype=np.int32)
+            distance = my_functions.pairs_session_farthest(
+                self._handle, output)
+            return ApprovalwiseVector(output, num_voters), distance
+
+    def basin_hopping_engine(approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet, x0: np.ndarray,
+                             niter: int, step_size: int, big_step_chance: float, seed: int) -> tuple[ApprovalwiseVector, int]:
+        x0 = np.ascontiguousarray(x0, dtype=np.int32)
 
-    def pairs(approvalwise_vectors: list[ApprovalwiseVector]) -> tuple[ApprovalwiseVector, int]:
-        return __create_binding(approvalwise_vectors, my_functions.pairs_binding)
+        def binding(data, num_voters, num_candidates, num_instances, output):
+            return my_functions.basin_hopping_binding(
+                data, num_voters, num_candidates, num_instances, x0, niter, step_size, big_step_chance, seed, output)
+        return __create_binding(approvalwise_vectors, binding)
 except Exception as e:
     sys.stderr.write(
         "Could not load the shared library, make sure you have compiled the C++ code and that the shared library is in the same directory as this file\n")
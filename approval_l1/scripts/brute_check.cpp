@@ -0,0 +1,103 @@
+#include <boost/program_options.hpp>
+#include <chrono>
+#include <iostream>
+#include <random>
+#include <vector>
+
+#include "approvalwise_vector.hpp"
+#include "brute.hpp"
+#include "greedy_dp.hpp"
+
+namespace po = boost::program_options;
+
+// Randomized check of brute against exhaustive enumeration of all
+// approvalwise vectors on small instances. Exits with 1 on the first
+// mismatch, otherwise reports how often greedy_dp is exact.
+
+approvalwise_vector_t random_approvalwise_vector(const int num_voters,
+                                                 const int num_candidates,
+                                                 mt19937& gen) {
+    approvalwise_vector_t vector(num_candidates);
+    for (auto& a : vector) {
+        a = gen() % (num_voters + 1);
+    }
+    sort(vector.rbegin(), vector.rend());
+    return vector;
+}
+
+// Farthest distance over all non-increasing vectors with values in [0, N].
+int enumerate_farthest(const vector<approvalwise_vector_t>& references,
+                       approvalwise_vector_t& vector, const int x,
+                       const int upper, const int num_voters) {
+    if (x == (int)vector.size()) {
+        return score_across(references, vector, num_voters);
+    }
+    int best = -1;
+    for (int y = 0; y <= upper; y++) {
+        vector[x] = y;
+        best = max(best,
+                   enumerate_farthest(references, vector, x + 1, y, num_voters));
+    }
+    return best;
+}
+
+signed main(int argc, char** argv) {
+    po::options_description desc("Allowed options");
+    desc.add_options()("help", "produce help message")(
+        "trials", po::value<int>()->default_value(1000), "number of trials")(
+        "max-voters", po::value<int>()->default_value(8),
+        "maximum number of voters")(
+        "max-candidates", po::value<int>()->default_value(6),
+        "maximum number of candidates")(
+        "max-references", po::value<int>()->default_value(6),
+        "maximum number of references")(
+        "seed", po::value<int>()->default_value(0), "random seed");
+
+    po::variables_map vm;
+    try {
+        po::store(po::parse_command_line(argc, argv, desc), vm);
+        po::notify(vm);
+    } catch (const po::error& e) {
+        std::cerr << "Error: " << e.what() << std::endl;
+        return 1;
+    }
+
+    if (vm.count("help")) {
+        std::cout << desc << "\n";
+        return 1;
+    }
+
+    const int trials = vm["trials"].as<int>();
+    const int max_voters = vm["max-voters"].as<int>();
+    const int max_candidates = vm["max-candidates"].as<int>();
+    const int max_references = vm["max-references"].as<int>();
+    mt19937 gen(vm["seed"].as<int>());
+
+    int greedy_dp_exact = 0;
+    for (int trial = 0; trial < trials; trial++) {
+        const int N = 1 + gen() % max_voters;
+        const int M = 1 + gen() % max_candidates;
+        const int R = 1 + gen() % max_references;
+        vector<approvalwise_vector_t> references;
+        for (int r = 0; r < R; r++) {
+            references.push_back(random_approvalwise_vector(N, M, gen));
+        }
+
+        approvalwise_vector_t vector(M);
+        const int expected = enumerate_farthest(references, vector, 0, N, N);
+        const auto [result, distance] =
+            brute::farthest_approvalwise_vector(references, N);
+        if (distance != expected ||
+            score_across(references, result, N) != expected ||
+            !is_sorted(result.rbegin(), result.rend())) {
+            cout << "Mismatch for N=" << N << ", M=" << M << ", R=" << R
+                 << ": expected " << expected << ", got " << distance << endl;
+            return 1;
+        }
+        greedy_dp_exact +=
+            greedy_dp::farthest_approvalwise_vector(references, N, 1).second ==
+            expected;
+    }
+    cout << trials << " trials OK, greedy_dp exact in " << greedy_dp_exact
+         << endl;
+}
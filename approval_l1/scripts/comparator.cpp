@@ -80,8 +80,7 @@ signed main(int argc, char** argv) {
         } else if (algorithm == "greedy_dp") {
             res = greedy_dp::farthest_approvalwise_vector(votings_hist, N);
         }
-        auto [next_voting_hist, score] =
-            brute::farthest_approvalwise_vector(votings_hist, N);
+        auto [next_voting_hist, score] = res;
 
         auto end_time = chrono::high_resolution_clock::now();
         auto elapsed_time =
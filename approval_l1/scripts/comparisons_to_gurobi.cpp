@@ -81,9 +81,13 @@ int main(int argc, char** argv) {
 
     std::string algorithm_name = argv[3];
     if (algorithm_name == "greedy_dp") {
-        algorithm = greedy_dp::farthest_approvalwise_vector;
+        algorithm = [](const auto& vectors, const int num_voters) {
+            return greedy_dp::farthest_approvalwise_vector(vectors, num_voters);
+        };
     } else if (algorithm_name == "pairs") {
-        algorithm = pairs::farthest_approvalwise_vector;
+        algorithm = [](const auto& vectors, const int num_voters) {
+            return pairs::farthest_approvalwise_vector(vectors, num_voters);
+        };
     } else {
         std::cerr << "Unknown algorithm: " << algorithm_name << "\n";
         return 1;
@@ -1,5 +1,10 @@
+from typing import Iterable
+
 import numpy as np
 from scripts.approvalwise_vector import ApprovalwiseVector
+from scripts.vp_tree import VPTree
+
+VP_TREE_THRESHOLD = 2048
 
 
 def l1(l: ApprovalwiseVector, r: ApprovalwiseVector):
@@ -9,7 +14,321 @@ def l1(l: ApprovalwiseVector, r: ApprovalwiseVector):
     return np.sum(np.abs(l - r))
 
 
-def l1_across(av: ApprovalwiseVector, other_avs: list[ApprovalwiseVector]) -> int:
+def l1_index(approvalwise_vectors: list[ApprovalwiseVector], threshold: int = VP_TREE_THRESHOLD) -> VPTree | np.ndarray:
+    """Prepares reference vectors for repeated `l1_across` queries, building a `VPTree` once there are at least
+    `threshold` of them and a plain array otherwise."""
+    if len(approvalwise_vectors) >= threshold:
+        return VPTree(approvalwise_vectors)
+    return np.asarray(approvalwise_vectors)
+
+
+def l1_across(av: ApprovalwiseVector, other_avs: list[ApprovalwiseVector] | VPTree) -> int:
+    if isinstance(other_avs, VPTree):
+        return other_avs.nearest(av)[1]
     av = np.array(av).reshape(1, -1)
-    other_avs = np.array(other_avs)
+    other_avs = np.asarray(other_avs)
     return np.min(np.sum(np.abs(av - other_avs), axis=1))
+
+
+def l1_distance(av: ApprovalwiseVector, index: VPTree | np.ndarray,
+                other_avs: list[ApprovalwiseVector] | np.ndarray) -> int:
+    """Distance of `av` to references indexed once with `l1_index` and to `other_avs`, e.g. vectors that change
+    between queries."""
+    distance = l1_across(av, index)
+    if len(other_avs):
+        distance = min(distance, l1_across(av, other_avs))
+    return distance
+
+
+def l1_across_many(candidates: list[ApprovalwiseVector] | np.ndarray, references: list[ApprovalwiseVector] | np.ndarray,
+                   memory_budget: int = 64 * 2**20) -> tuple[np.ndarray, int]:
+    """# Summary
+    Scores every candidate by its L1 distance to the closest reference in one vectorized pass.
+
+    Candidates are processed in chunks, such that the temporary `chunk x R x M` difference array fits in
+    `memory_budget` bytes.
+
+    ## Args:
+        `candidates` (list[ApprovalwiseVector] | np.ndarray): `K` candidate vectors.
+        `references` (list[ApprovalwiseVector] | np.ndarray): `R` reference vectors.
+        `memory_budget` (int, optional): Maximum size of temporary arrays in bytes. Defaults to 64 MiB.
+
+    ## Returns:
+        -> tuple[np.ndarray, int]: Distances of all candidates to the reference set and index of the farthest
+        candidate.
+    """
+    candidates = np.asarray(candidates)
+    references = np.asarray(references)
+    if not len(candidates) or not len(references):
+        raise ValueError('Cannot score an empty set of candidates or references')
+    num_references, num_candidates = references.shape
+    dtype = np.result_type(candidates.dtype, references.dtype)
+
+    row_bytes = num_references * num_candidates * dtype.itemsize
+    chunk_size = max(1, memory_budget // max(row_bytes, 1))
+
+    distances = np.empty(len(candidates), dtype=np.int64)
+    for start in range(0, len(candidates), chunk_size):
+        chunk = candidates[start:start + chunk_size, np.newaxis, :]
+        distances[start:start + chunk_size] = np.sum(
+            np.abs(chunk - references[np.newaxis]), axis=2).min(axis=1)
+
+    return distances, int(distances.argmax())
+
+
+def select_diverse(vectors: np.ndarray, distances: np.ndarray, k: int, min_separation: int = 1) -> np.ndarray:
+    """# Summary
+    Greedily picks up to `k` vectors with the largest `distances`, such that every two picked vectors are at least
+    `min_separation` apart in L1.
+
+    ## Args:
+        `vectors` (np.ndarray): Candidate vectors as a `K x M` array.
+        `distances` (np.ndarray): Score of every candidate, e.g. its distance to a reference set.
+        `k` (int): Maximum number of picked vectors.
+        `min_separation` (int, optional): Minimum L1 distance between picked vectors. Defaults to `1`.
+
+    ## Returns:
+        -> np.ndarray: Indices of picked vectors, in non-increasing order of `distances`.
+    """
+    vectors = np.asarray(vectors)
+    picked = []
+    for idx in np.argsort(-np.asarray(distances), kind='stable'):
+        if len(picked) == k:
+            break
+        if not picked or np.sum(np.abs(vectors[picked] - vectors[idx]), axis=1).min() >= min_separation:
+            picked.append(idx)
+    return np.array(picked, dtype=int)
+
+
+def l1_unit_step_delta(references: np.ndarray, x: np.ndarray, idx: int, dx: int) -> np.ndarray:
+    """Change of L1 distances from `x` to every reference after `x[idx] += dx`, in O(R)."""
+    column = references[:, idx]
+    return np.abs(x[idx] + dx - column) - np.abs(x[idx] - column)
+
+
+def l1_shift_delta(references: np.ndarray, x: np.ndarray, lo: int, hi: int, dx: int) -> np.ndarray:
+    """Change of L1 distances from `x` to every reference after `x[lo:hi] += dx` for `dx` in {-1, 1}, in
+    O(R * (hi - lo)).
+
+    Every shifted coordinate moves one unit away from or towards the reference, so only the number of coordinates
+    moving away has to be counted, with one comparison per reference and shifted coordinate."""
+    block = references[:, lo:hi]
+    values = x[lo:hi]
+    moving_away = np.count_nonzero(
+        values >= block if dx > 0 else values <= block, axis=1)
+    return 2 * moving_away - (hi - lo)
+
+
+class DistanceIndex:
+    """Growing set of reference approvalwise vectors stored as one contiguous array.
+
+    Besides the references, the index keeps a set of tracked vectors together with their running minimum L1
+    distance to the references. Appending a reference updates every tracked distance in O(`num_candidates`),
+    so sequential loops never rescan the whole set to ask how far a fixed vector is from it.
+    """
+
+    def __init__(self, approvalwise_vectors: Iterable[ApprovalwiseVector] = (),
+                 tracked: Iterable[ApprovalwiseVector] = (), num_candidates: int | None = None):
+        approvalwise_vectors = list(approvalwise_vectors)
+        tracked = list(tracked)
+        if num_candidates is None:
+            sample = next(iter(approvalwise_vectors + tracked), None)
+            if sample is None:
+                raise ValueError(
+                    'Cannot infer number of candidates from an empty index')
+            num_candidates = len(sample)
+
+        self._size = 0
+        self._data = np.zeros(
+            (max(len(approvalwise_vectors), 16), num_candidates), dtype=np.int32)
+        self._tracked = np.zeros((0, num_candidates), dtype=np.int32)
+        self._tracked_distances = np.zeros(0, dtype=np.int64)
+
+        self.extend(approvalwise_vectors)
+        for x in tracked:
+            self.track(x)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __array__(self, dtype=None):
+        return self.vectors if dtype is None else self.vectors.astype(dtype)
+
+    @property
+    def num_candidates(self) -> int:
+        return self._data.shape[1]
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._data[:self._size]
+
+    @property
+    def tracked_distances(self) -> np.ndarray:
+        return self._tracked_distances
+
+    def append(self, approvalwise_vector: ApprovalwiseVector) -> None:
+        if self._size == len(self._data):
+            self._data = np.concatenate(
+                [self._data, np.zeros_like(self._data)], axis=0)
+        self._data[self._size] = approvalwise_vector
+        self._size += 1
+
+        distances = np.sum(
+            np.abs(self._tracked - self._data[self._size - 1]), axis=1)
+        np.minimum(self._tracked_distances, distances,
+                   out=self._tracked_distances)
+
+    def extend(self, approvalwise_vectors: Iterable[ApprovalwiseVector]) -> None:
+        for approvalwise_vector in approvalwise_vectors:
+            self.append(approvalwise_vector)
+
+    def track(self, x: ApprovalwiseVector) -> int:
+        """Starts tracking `x`, computing its distance to the current references once. Returns its tracked index."""
+        x = np.asarray(x, dtype=np.int32).reshape(1, -1)
+        self._tracked = np.concatenate([self._tracked, x], axis=0)
+        self._tracked_distances = np.append(
+            self._tracked_distances, self.distance(x[0]))
+        return len(self._tracked) - 1
+
+    def distance(self, x: ApprovalwiseVector) -> int:
+        if self._size == 0:
+            return np.iinfo(np.int64).max
+        return int(l1_across(x, self.vectors))
+
+
+class ApprovalSumIndex:
+    """# Summary
+    Reference set answering minimum L1 distance queries with lower-bound pruning.
+
+    Reference vectors are ordered by their total number of approvals and keep cached sums over `num_segments`
+    consecutive segments of candidates. For any two vectors, the L1 distance is at least the L1 distance of their
+    segment sums, which in turn is at least the difference of their totals. A query therefore binary searches the
+    references whose totals are close enough, filters them with the segment bound and computes exact distances only
+    for the remaining ones, closest bound first.
+
+    ## Args:
+        `approvalwise_vectors` (Iterable[ApprovalwiseVector]): Initial reference vectors.
+        `num_segments` (int, optional): Number of candidate segments used for the lower bound. Defaults to `8`.
+        `block_size` (int, optional): Number of exact distances computed at once. Defaults to `32`.
+        `num_candidates` (int | None, optional): Length of vectors, required only for an initially empty index.
+    """
+
+    def __init__(self, approvalwise_vectors: Iterable[ApprovalwiseVector] = (), num_segments: int = 8,
+                 block_size: int = 32, num_candidates: int | None = None):
+        approvalwise_vectors = list(approvalwise_vectors)
+        if num_candidates is None:
+            if not approvalwise_vectors:
+                raise ValueError(
+                    'Cannot infer number of candidates from an empty index')
+            num_candidates = len(approvalwise_vectors[0])
+
+        self._block_size = block_size
+        self._bounds = np.unique(np.linspace(
+            0, num_candidates, num_segments + 1).round().astype(int))
+        self._size = len(approvalwise_vectors)
+        capacity = max(self._size, 16)
+        self._data = np.zeros((capacity, num_candidates), dtype=np.int32)
+        self._segments = np.zeros(
+            (capacity, len(self._bounds) - 1), dtype=np.int64)
+        # `_order[:size]` are indices of references sorted by their totals, kept in `_sorted_totals[:size]`
+        self._order = np.zeros(capacity, dtype=np.int64)
+        self._sorted_totals = np.zeros(capacity, dtype=np.int64)
+
+        if self._size:
+            self._data[:self._size] = approvalwise_vectors
+            self._segments[:self._size] = self._segment_sums(
+                self._data[:self._size])
+            totals = self._segments[:self._size].sum(axis=1)
+            # stable, so equal totals keep insertion order as with `insert`
+            self._order[:self._size] = np.argsort(totals, kind='stable')
+            self._sorted_totals[:self._size] = totals[self._order[:self._size]]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def copy(self) -> 'ApprovalSumIndex':
+        """Returns an independent copy, e.g. to extend the same references differently in several trials."""
+        index = ApprovalSumIndex.__new__(ApprovalSumIndex)
+        index.__dict__.update(self.__dict__)
+        for name in ['_data', '_segments', '_order', '_sorted_totals']:
+            setattr(index, name, getattr(self, name).copy())
+        return index
+
+    def _segment_sums(self, x: np.ndarray) -> np.ndarray:
+        return np.add.reduceat(np.asarray(x, dtype=np.int64), self._bounds[:-1], axis=-1)
+
+    def insert(self, approvalwise_vector: ApprovalwiseVector) -> None:
+        if self._size == len(self._data):
+            for name in ['_data', '_segments', '_order', '_sorted_totals']:
+                array = getattr(self, name)
+                setattr(self, name, np.concatenate(
+                    [array, np.zeros_like(array)], axis=0))
+        idx = self._size
+        self._data[idx] = approvalwise_vector
+        self._segments[idx] = self._segment_sums(self._data[idx])
+
+        # the sorted arrays have spare capacity, so the tail is shifted in place instead of reallocated
+        total = self._segments[idx].sum()
+        pos = np.searchsorted(self._sorted_totals[:idx], total, side='right')
+        self._order[pos + 1:idx + 1] = self._order[pos:idx]
+        self._order[pos] = idx
+        self._sorted_totals[pos + 1:idx + 1] = self._sorted_totals[pos:idx]
+        self._sorted_totals[pos] = total
+        self._size += 1
+
+    def min_distance(self, x: ApprovalwiseVector, stop_below: int | None = None) -> int:
+        """# Summary
+        Computes L1 distance from `x` to the closest reference vector.
+
+        ## Args:
+            `x` (ApprovalwiseVector): Queried vector.
+            `stop_below` (int | None, optional): If given, the search stops as soon as any reference closer than
+            `stop_below` is found, returning that (not necessarily minimal) distance. Useful when only
+            `min_distance(x) < stop_below` matters. Defaults to `None`.
+
+        ## Returns:
+            -> int: Distance to the closest reference, or to the first reference found closer than `stop_below`.
+        """
+        best = np.iinfo(np.int64).max
+        if self._size == 0:
+            return best
+
+        x = np.asarray(x)
+        x_segments = self._segment_sums(x)
+        x_total = x_segments.sum()
+
+        # the sorted arrays have spare capacity past `_size`
+        order = self._order[:self._size]
+        sorted_totals = self._sorted_totals[:self._size]
+
+        def exact(positions: np.ndarray) -> int:
+            rows = self._data[order[positions]]
+            return int(np.sum(np.abs(rows - x), axis=1).min())
+
+        pos = np.searchsorted(sorted_totals, x_total)
+        seed_lo = max(0, pos - self._block_size // 2)
+        seed_hi = min(self._size, seed_lo + self._block_size)
+        best = exact(np.arange(seed_lo, seed_hi))
+        if stop_below is not None and best < stop_below:
+            return best
+
+        lo = np.searchsorted(sorted_totals, x_total - best, side='right')
+        hi = np.searchsorted(sorted_totals, x_total + best, side='left')
+        positions = np.concatenate(
+            [np.arange(lo, min(hi, seed_lo)), np.arange(max(lo, seed_hi), hi)])
+
+        lower_bounds = np.sum(
+            np.abs(self._segments[order[positions]] - x_segments), axis=1)
+        by_bound = np.argsort(lower_bounds, kind='stable')
+        positions, lower_bounds = positions[by_bound], lower_bounds[by_bound]
+
+        for start in range(0, len(positions), self._block_size):
+            if lower_bounds[start] >= best:
+                break
+            block = slice(start, start + self._block_size)
+            block_positions = positions[block][lower_bounds[block] < best]
+            best = min(best, exact(block_positions))
+            if stop_below is not None and best < stop_below:
+                break
+
+        return best
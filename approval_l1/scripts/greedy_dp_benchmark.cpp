@@ -0,0 +1,195 @@
+#include <algorithm>
+#include <boost/program_options.hpp>
+#include <chrono>
+#include <iomanip>
+#include <iostream>
+#include <random>
+#include <vector>
+
+#include "approvalwise_vector.hpp"
+
+namespace po = boost::program_options;
+
+// Micro-benchmark of the inner loops of greedy_dp and score_across, comparing
+// references read row by row from a vector of vectors (the previous layout)
+// with the candidate-major ReferenceMatrix.
+
+vector<approvalwise_vector_t> random_references(const int num_voters,
+                                                const int num_candidates,
+                                                const int num_references,
+                                                mt19937& gen) {
+    uniform_int_distribution<int> value(0, num_voters);
+    vector<approvalwise_vector_t> references(num_references,
+                                             vi(num_candidates));
+    for (auto& reference : references) {
+        for (auto& a : reference) {
+            a = value(gen);
+        }
+        sort(reference.rbegin(), reference.rend());
+    }
+    return references;
+}
+
+// One greedy_dp column with the previous layout: per-reference distances of
+// the previous column as vvi and references gathered from every row.
+long long column_rows(const vector<approvalwise_vector_t>& references,
+                      const vvi& dp_prev, const int x, const int num_voters) {
+    const int num_references = references.size();
+    long long checksum = 0;
+    for (int y = num_voters; y >= 0; --y) {
+        int max_for_y = -1;
+        for (int y_prev = num_voters; y_prev >= y; y_prev--) {
+            int min_for_r = INT32_MAX;
+            for (int r = 0; r < num_references; r++) {
+                min_for_r = min(min_for_r, abs(y - references[r][x]) +
+                                               dp_prev[y_prev][r]);
+            }
+            max_for_y = max(max_for_y, min_for_r);
+        }
+        checksum += max_for_y;
+    }
+    return checksum;
+}
+
+// The same column with flat layers and costs precomputed from a contiguous
+// column of ReferenceMatrix.
+long long column_matrix(const ReferenceMatrix& references, const vi& dp_prev,
+                        vi& cost, const int x, const int num_voters) {
+    const int num_references = references.num_references;
+    const int* column = references.column(x);
+    for (int y = 0; y <= num_voters; y++) {
+        for (int r = 0; r < num_references; r++) {
+            cost[y * num_references + r] = abs(y - column[r]);
+        }
+    }
+    long long checksum = 0;
+    for (int y = num_voters; y >= 0; --y) {
+        const int* cost_y = &cost[y * num_references];
+        int max_for_y = -1;
+        for (int y_prev = num_voters; y_prev >= y; y_prev--) {
+            const int* prev = &dp_prev[y_prev * num_references];
+            int min_for_r = INT32_MAX;
+            for (int r = 0; r < num_references; r++) {
+                min_for_r = min(min_for_r, cost_y[r] + prev[r]);
+            }
+            max_for_y = max(max_for_y, min_for_r);
+        }
+        checksum += max_for_y;
+    }
+    return checksum;
+}
+
+int score_across_rows(const vector<approvalwise_vector_t>& references,
+                      const approvalwise_vector_t& voting,
+                      const int num_voters) {
+    int min_score = voting.size() * num_voters + 1;
+    for (const auto& reference : references) {
+        min_score = min(min_score, dist_l1(voting, reference));
+    }
+    return min_score;
+}
+
+template <typename F>
+double seconds(const int repeats, F&& f) {
+    auto start_time = chrono::high_resolution_clock::now();
+    for (int i = 0; i < repeats; i++) {
+        f(i);
+    }
+    auto end_time = chrono::high_resolution_clock::now();
+    return chrono::duration<double>(end_time - start_time).count() / repeats;
+}
+
+void benchmark(const int num_candidates, const int num_voters,
+               const int num_references, const int repeats, mt19937& gen) {
+    const auto references = random_references(num_voters, num_candidates,
+                                              num_references, gen);
+    const ReferenceMatrix matrix(references);
+
+    uniform_int_distribution<int> value(0, num_voters * num_candidates);
+    vvi dp_rows(num_voters + 1, vi(num_references));
+    vi dp_flat((num_voters + 1) * num_references);
+    vi cost((num_voters + 1) * num_references);
+    for (int y = 0; y <= num_voters; y++) {
+        for (int r = 0; r < num_references; r++) {
+            dp_rows[y][r] = dp_flat[y * num_references + r] = value(gen);
+        }
+    }
+
+    // every repetition runs on another column, so calls cannot be hoisted
+    long long checksum_rows = 0, checksum_matrix = 0;
+    const double column_rows_time = seconds(repeats, [&](const int i) {
+        checksum_rows += column_rows(references, dp_rows, i % num_candidates,
+                                     num_voters);
+    });
+    const double column_matrix_time = seconds(repeats, [&](const int i) {
+        checksum_matrix += column_matrix(matrix, dp_flat, cost,
+                                         i % num_candidates, num_voters);
+    });
+    if (checksum_rows != checksum_matrix) {
+        cerr << "Error: column kernels disagree" << endl;
+    }
+
+    const auto candidates = random_references(num_voters, num_candidates,
+                                              num_references, gen);
+    long long score_rows = 0, score_matrix = 0;
+    const double score_rows_time = seconds(repeats, [&](const int) {
+        for (const auto& candidate : candidates) {
+            score_rows += score_across_rows(references, candidate, num_voters);
+        }
+    });
+    const double score_matrix_time = seconds(repeats, [&](const int) {
+        for (const auto& candidate : candidates) {
+            score_matrix += score_across(matrix, candidate, num_voters);
+        }
+    });
+    if (score_rows != score_matrix) {
+        cerr << "Error: score_across kernels disagree" << endl;
+    }
+
+    // (N+1)(N+2)/2 pairs of heights per column, each reduced over R references
+    const double column_ops =
+        0.5 * (num_voters + 1) * (num_voters + 2) * num_references;
+    const double score_ops = 1.0 * num_references * num_references *
+                             num_candidates;
+    cout << num_candidates << 'x' << num_voters << ',' << num_references
+         << ",greedy_dp_column," << fixed << setprecision(3)
+         << column_ops / column_rows_time / 1e9 << ','
+         << column_ops / column_matrix_time / 1e9 << ','
+         << column_rows_time / column_matrix_time << endl;
+    cout << num_candidates << 'x' << num_voters << ',' << num_references
+         << ",score_across," << score_ops / score_rows_time / 1e9 << ','
+         << score_ops / score_matrix_time / 1e9 << ','
+         << score_rows_time / score_matrix_time << endl;
+}
+
+signed main(int argc, char** argv) {
+    po::options_description desc("Allowed options");
+    desc.add_options()("help", "produce help message")(
+        "references,R", po::value<int>()->default_value(200),
+        "number of reference vectors")(
+        "repeats", po::value<int>()->default_value(5),
+        "number of timed repetitions")(
+        "seed", po::value<int>()->default_value(0), "random seed");
+
+    po::variables_map vm;
+    try {
+        po::store(po::parse_command_line(argc, argv, desc), vm);
+        po::notify(vm);
+    } catch (const po::error& e) {
+        std::cerr << "Error: " << e.what() << std::endl;
+        return 1;
+    }
+
+    if (vm.count("help")) {
+        std::cout << desc << "\n";
+        return 1;
+    }
+
+    const int R = vm["references"].as<int>();
+    const int repeats = vm["repeats"].as<int>();
+    mt19937 gen(vm["seed"].as<int>());
+
+    cout << "shape,references,kernel,rows_gops,matrix_gops,speedup" << endl;
+    benchmark(30, 60, R, repeats, gen);
+    benchmark(50, 500, R, repeats, gen);
+}
@@ -5,7 +5,7 @@ from typing import Optional
 import numpy as np
 
 from scripts.sampling_methods import find_best_starting_step_vector
-from scripts.approvalwise_vector import ApprovalwiseVector
+from scripts.approvalwise_vector import ApprovalwiseVector, ApprovalwiseVectorSet
 
 try:
     import gurobipy as gp
@@ -16,7 +16,7 @@ except ImportError:
     )
 
 
-def gurobi_ilp(approvalwise_vectors: list[ApprovalwiseVector], max_dist: int = None, x0: Optional[ApprovalwiseVector] = None, seed: Optional[int] = None) -> tuple[ApprovalwiseVector, int]:
+def gurobi_ilp(approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet, max_dist: int = None, x0: Optional[ApprovalwiseVector | list[ApprovalwiseVector]] = None, seed: Optional[int] = None) -> tuple[ApprovalwiseVector, int]:
     """# Summary
     Generates farthest approvalwise vector from the given approvalwise vectors.
 
@@ -31,7 +31,8 @@ def gurobi_ilp(approvalwise_vectors: list[ApprovalwiseVector], max_dist: int = N
         `max_dist` (int, optional): Maximum possible distance that can be obtained. Usually set to the previous farthest
         distance. Defaults to `None`.
 
-        `x0` (Optional[ApprovalwiseVector], optional): Initial point for Gurobi algorithm. Defaults to `None`.
+        `x0` (Optional[ApprovalwiseVector | list[ApprovalwiseVector]], optional): Initial point for Gurobi algorithm,
+        or a list of them passed as multiple MIP starts, e.g. from `basin_hopping` with `top_k`. Defaults to `None`.
 
     ## Returns:
         -> tuple[ApprovalwiseVector, int]: Farthest approvalwise vector and its distance from given approvalwise
@@ -85,8 +86,12 @@ def gurobi_ilp(approvalwise_vectors: list[ApprovalwiseVector], max_dist: int = N
         candidates[:, ::-1].sort(axis=1)
         x0 = find_best_starting_step_vector(
             approvalwise_vectors, candidates)
-    for i in range(num_candidates):
-        fav[i].Start = x0[i]
+    starts = np.asarray(x0).reshape(-1, num_candidates)
+    model.NumStart = len(starts)
+    for start, x0 in enumerate(starts):
+        model.params.StartNumber = start
+        for i in range(num_candidates):
+            fav[i].Start = x0[i]
     model.optimize()
 
     vector = [int(fav[i].X) for i in range(num_candidates)]
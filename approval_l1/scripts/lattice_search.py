@@ -0,0 +1,309 @@
+import time
+from collections import deque
+from typing import Callable
+
+import numpy as np
+from scripts.distances import l1_shift_delta, l1_unit_step_delta, select_diverse
+
+
+class StoppingCriteria:
+    """# Summary
+    Early stopping rules of a basin hopping run, fed with the best distance found after every iteration.
+
+    ## Args:
+        `patience` (int | None): Stop after this many iterations without improvement.
+        `target_distance` (int | None): Stop once the best distance reaches this value.
+        `time_budget` (float | None): Stop after this many seconds since creation.
+    """
+
+    def __init__(self, patience: int | None = None, target_distance: int | None = None,
+                 time_budget: float | None = None):
+        self.patience = patience
+        self.target_distance = target_distance
+        self.time_budget = time_budget
+        self.reason = 'niter'
+
+        self._start = time.time()
+        self._best_distance = None
+        self._since_improvement = 0
+
+    def update(self, best_distance: int) -> bool:
+        """Records the best distance after an iteration and returns whether the run should stop."""
+        if self._best_distance is None or best_distance > self._best_distance:
+            self._best_distance = best_distance
+            self._since_improvement = 0
+        else:
+            self._since_improvement += 1
+
+        if self.target_distance is not None and self._best_distance >= self.target_distance:
+            self.reason = 'target_distance'
+        elif self.patience is not None and self._since_improvement >= self.patience:
+            self.reason = 'patience'
+        elif self.time_budget is not None and time.time() - self._start >= self.time_budget:
+            self.reason = 'time_budget'
+        else:
+            return False
+        return True
+
+
+class StepTuner:
+    """# Summary
+    Online tuning of `step_size` and `big_step_chance` of a basin hopping run.
+
+    Outcomes of the last `window` proposals are kept in a sliding window. Once it is full, every `interval`
+    proposals `step_size` grows by a quarter when unit-step proposals in the window were accepted more often than
+    `target_accept_rate` and shrinks by a quarter otherwise, and `big_step_chance` moves by `0.05` towards the move
+    type with the larger distance gain per proposal. Every change is logged in `trajectory`.
+
+    ## Args:
+        `step_size` (int): Initial maximum number of unit steps per proposal.
+        `big_step_chance` (float): Initial chance of a big step.
+        `max_step_size` (int): Upper limit of `step_size`.
+        `target_accept_rate` (float, optional): Desired acceptance rate of unit-step proposals. Defaults to `0.5`.
+        `window` (int, optional): Number of latest proposals the statistics are computed on. Defaults to `100`.
+        `interval` (int, optional): Number of proposals between adjustments. Defaults to `25`.
+        `big_step_chance_bounds` (tuple[float, float], optional): Bounds of `big_step_chance`, keeping both move types
+        sampled. Defaults to `(0.05, 0.5)`.
+    """
+
+    def __init__(self, step_size: int, big_step_chance: float, max_step_size: int, target_accept_rate: float = 0.5,
+                 window: int = 100, interval: int = 25, big_step_chance_bounds: tuple[float, float] = (0.05, 0.5)):
+        self.max_step_size = max_step_size
+        self.target_accept_rate = target_accept_rate
+        self.window = window
+        self.interval = interval
+        self.big_step_chance_bounds = big_step_chance_bounds
+        self.step_size = min(max(step_size, 1), max_step_size)
+        self.big_step_chance = float(np.clip(
+            big_step_chance, *big_step_chance_bounds))
+        self.trajectory = []
+
+        self._iteration = 0
+        self._outcomes: deque[tuple[bool, bool, int]] = deque()
+        # running sums over `_outcomes` by move type
+        self._proposals = {False: 0, True: 0}
+        self._accepted = {False: 0, True: 0}
+        self._gains = {False: 0, True: 0}
+
+    def _count(self, big: bool, accepted: bool, gain: int, sign: int) -> None:
+        self._proposals[big] += sign
+        self._accepted[big] += sign * accepted
+        self._gains[big] += sign * gain
+
+    def record(self, big: bool, accepted: bool, gain: int) -> None:
+        """Records a proposal, whether it was a big step, whether it was accepted and the gain of current distance."""
+        self._iteration += 1
+        outcome = (big, accepted, max(gain, 0))
+        self._outcomes.append(outcome)
+        self._count(*outcome, 1)
+        if len(self._outcomes) > self.window:
+            self._count(*self._outcomes.popleft(), -1)
+        if len(self._outcomes) == self.window and self._iteration % self.interval == 0:
+            self._adjust()
+
+    def _adjust(self) -> None:
+        unit_proposals = self._proposals[False]
+        accept_rate = self._accepted[False] / \
+            unit_proposals if unit_proposals else self.target_accept_rate
+        if accept_rate > self.target_accept_rate:
+            self.step_size = min(self.max_step_size, max(
+                self.step_size + 1, round(self.step_size * 1.25)))
+        elif accept_rate < self.target_accept_rate:
+            self.step_size = max(1, min(
+                self.step_size - 1, round(self.step_size / 1.25)))
+
+        if self._proposals[False] and self._proposals[True]:
+            unit_gain = self._gains[False] / self._proposals[False]
+            big_gain = self._gains[True] / self._proposals[True]
+            self.big_step_chance = round(float(np.clip(
+                self.big_step_chance + 0.05 * np.sign(big_gain - unit_gain), *self.big_step_chance_bounds)), 2)
+
+        self.trajectory.append({
+            'iteration': self._iteration,
+            'accept_rate': accept_rate,
+            'step_size': self.step_size,
+            'big_step_chance': self.big_step_chance,
+        })
+
+
+class LocalOptima:
+    """# Summary
+    Distinct states visited by a basin hopping run, with their distances. Used as an `on_accept` callback.
+
+    Once more than twice `capacity` states are stored, only `capacity` farthest ones are kept.
+
+    ## Args:
+        `num_candidates` (int): Length of vectors.
+        `capacity` (int, optional): Number of states kept after pruning. Defaults to `1024`.
+    """
+
+    def __init__(self, num_candidates: int, capacity: int = 1024):
+        self.num_candidates = num_candidates
+        self.capacity = capacity
+        self._found: dict[bytes, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._found)
+
+    def __call__(self, x: np.ndarray, distance: int) -> None:
+        self._found[np.asarray(x, dtype=np.int32).tobytes()] = int(distance)
+        if len(self._found) > 2 * self.capacity:
+            for key in sorted(self._found, key=self._found.get)[:len(self._found) - self.capacity]:
+                del self._found[key]
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """Returns stored states as a `K x M` array and their distances."""
+        vectors = np.frombuffer(b''.join(self._found), dtype=np.int32).reshape(-1, self.num_candidates)
+        return vectors, np.fromiter(self._found.values(), dtype=np.int64, count=len(self._found))
+
+    def diverse(self, k: int, min_separation: int = 1) -> tuple[np.ndarray, np.ndarray]:
+        """Returns up to `k` farthest states at least `min_separation` apart and their distances."""
+        vectors, distances = self.arrays()
+        picked = select_diverse(vectors, distances, k, min_separation)
+        return vectors[picked], distances[picked]
+
+
+class LatticeSearch:
+    """# Summary
+    Basin hopping on the integer lattice of approvalwise vectors, without a continuous local minimizer.
+
+    The search keeps the current vector `x` together with its distances to every reference. Proposals are made of
+    the same moves as in `basin_hopping`: from 1 to `step_size` unit steps (+1 or -1 on one coordinate) or a big step
+    (+1 on a suffix or -1 on a prefix). A unit move and a big move starting at the same coordinate and direction are
+    feasible under the same condition, so feasible moves are kept in one index updated in O(1) per move and sampled
+    directly instead of by rejection. Proposals are evaluated from move deltas in O(R) (O(R * shifted length) for big
+    steps), accepted with the Metropolis criterion and reverted in place when rejected.
+
+    ## Args:
+        `approvalwise_vectors` (np.ndarray): Reference vectors as a `R x M` array.
+        `num_voters` (int): Number of voters.
+        `x0` (np.ndarray): Starting vector.
+        `rng` (np.random.Generator): Random engine.
+        `temperature` (float, optional): Metropolis temperature. Defaults to `1.0` as in scipy's basinhopping.
+    """
+
+    def __init__(self, approvalwise_vectors: np.ndarray, num_voters: int, x0: np.ndarray, rng: np.random.Generator,
+                 temperature: float = 1.0):
+        self.approvalwise_vectors = np.asarray(approvalwise_vectors)
+        self.num_voters = num_voters
+        self.num_candidates = self.approvalwise_vectors.shape[1]
+        self.rng = rng
+        self.temperature = temperature
+
+        self.x = np.array(x0, dtype=np.int64)
+        self.distances = np.sum(
+            np.abs(self.approvalwise_vectors - self.x), axis=1)
+        self.distance = int(self.distances.min())
+        self.best_x = self.x.copy()
+        self.best_distance = self.distance
+        self.nfev = 1
+        self.nit = 0
+        self.last_big = False
+
+        # move `2 * idx + 1` is +1 at `idx`, move `2 * idx` is -1 at `idx`
+        self._moves = np.zeros(2 * self.num_candidates, dtype=np.int64)
+        self._positions = np.full(2 * self.num_candidates, -1, dtype=np.int64)
+        self._num_moves = 0
+        for idx in range(self.num_candidates):
+            self._refresh(idx)
+
+    def _upper(self, idx: int) -> int:
+        return self.num_voters if idx == 0 else self.x[idx - 1]
+
+    def _lower(self, idx: int) -> int:
+        return 0 if idx == self.num_candidates - 1 else self.x[idx + 1]
+
+    def _set_feasible(self, move: int, feasible: bool) -> None:
+        position = self._positions[move]
+        if feasible and position < 0:
+            self._moves[self._num_moves] = move
+            self._positions[move] = self._num_moves
+            self._num_moves += 1
+        elif not feasible and position >= 0:
+            self._num_moves -= 1
+            last = self._moves[self._num_moves]
+            self._moves[position] = last
+            self._positions[last] = position
+            self._positions[move] = -1
+
+    def _refresh(self, *indices: int) -> None:
+        for idx in indices:
+            if 0 <= idx < self.num_candidates:
+                self._set_feasible(2 * idx + 1, self._upper(idx) > self.x[idx])
+                self._set_feasible(2 * idx, self.x[idx] > self._lower(idx))
+
+    def _apply(self, idx: int, dx: int, big: bool, undo: bool = False) -> None:
+        shift = -dx if undo else dx
+        if not big:
+            self.x[idx] += shift
+            self._refresh(idx - 1, idx, idx + 1)
+        elif dx > 0:
+            self.x[idx:] += shift
+            self._refresh(idx - 1, idx, self.num_candidates - 1)
+        else:
+            self.x[:idx + 1] += shift
+            self._refresh(0, idx, idx + 1)
+
+    def _delta(self, idx: int, dx: int, big: bool) -> np.ndarray:
+        if not big:
+            return l1_unit_step_delta(self.approvalwise_vectors, self.x, idx, dx)
+        elif dx > 0:
+            return l1_shift_delta(self.approvalwise_vectors, self.x, idx, self.num_candidates, dx)
+        else:
+            return l1_shift_delta(self.approvalwise_vectors, self.x, 0, idx + 1, dx)
+
+    def _random_move(self) -> tuple[int, int]:
+        move = self._moves[self.rng.integers(self._num_moves)]
+        return move // 2, 1 if move % 2 else -1
+
+    def step(self, step_size: int, big_step_chance: float) -> bool:
+        """Makes one proposal and accepts or reverts it. Returns whether it was accepted."""
+        if self._num_moves == 0:
+            return False
+
+        big = self.rng.random() < big_step_chance
+        self.last_big = big
+        num_moves = 1 if big else self.rng.integers(1, step_size + 1)
+        distances = self.distances
+        applied = []
+        for _ in range(num_moves):
+            idx, dx = self._random_move()
+            distances = distances + self._delta(idx, dx, big)
+            self._apply(idx, dx, big)
+            applied.append((idx, dx))
+
+        distance = int(distances.min())
+        self.nfev += 1
+        accept = distance >= self.distance or \
+            self.rng.random() < np.exp((distance - self.distance) / self.temperature)
+
+        if not accept:
+            for idx, dx in reversed(applied):
+                self._apply(idx, dx, big, undo=True)
+            return False
+
+        self.distances = distances
+        self.distance = distance
+        if distance > self.best_distance:
+            self.best_distance = distance
+            self.best_x = self.x.copy()
+        return True
+
+    def run(self, niter: int, step_size: int, big_step_chance: float,
+            stopping: StoppingCriteria | None = None, tuner: StepTuner | None = None,
+            on_accept: Callable[[np.ndarray, int], None] | None = None) -> tuple[np.ndarray, int]:
+        if stopping is not None and stopping.update(self.best_distance):
+            return self.best_x, self.best_distance
+        for _ in range(niter):
+            if tuner is not None:
+                step_size, big_step_chance = tuner.step_size, tuner.big_step_chance
+            distance = self.distance
+            accepted = self.step(step_size, big_step_chance)
+            if tuner is not None:
+                tuner.record(self.last_big, accepted, self.distance - distance)
+            if accepted and on_accept is not None:
+                on_accept(self.x, self.distance)
+            self.nit += 1
+            if stopping is not None and stopping.update(self.best_distance):
+                break
+        return self.best_x, self.best_distance
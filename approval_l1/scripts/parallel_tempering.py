@@ -0,0 +1,142 @@
+from typing import Optional
+
+import numpy as np
+from scripts.approvalwise_vector import ApprovalwiseVector, ApprovalwiseVectorSet
+from scripts.distances import l1_across_many
+from scripts.sampling_methods import random_approvalwise_vectors
+
+
+def __starting_replicas(approvalwise_vectors, num_voters, num_candidates, num_replicas, rng):
+    step_vectors = np.full((num_candidates + 1, num_candidates), num_voters)
+    for i in range(num_candidates):
+        step_vectors[i, i:] = 0
+    random_vectors = random_approvalwise_vectors(
+        num_voters, num_candidates, rng=rng, tries=max(100, 10 * num_replicas))
+    candidates = np.concatenate([step_vectors, random_vectors])
+    distances, _best_idx = l1_across_many(candidates, approvalwise_vectors)
+    best = np.argsort(-distances, kind='stable')[:num_replicas]
+    return candidates[np.resize(best, num_replicas)].astype(np.int64)
+
+
+def __propose(x, num_voters, step_size, big_step_chance, rng):
+    num_replicas, num_candidates = x.shape
+    replicas = np.arange(num_replicas)
+    proposals = x.copy()
+
+    # A move is applied only where it keeps the vector non-increasing, otherwise the replica stays in place for it.
+    def upper(idx):
+        return np.where(idx > 0, proposals[replicas, np.maximum(idx - 1, 0)], num_voters)
+
+    def lower(idx):
+        return np.where(idx < num_candidates - 1, proposals[replicas, np.minimum(idx + 1, num_candidates - 1)], 0)
+
+    big = rng.random(num_replicas) < big_step_chance
+    num_steps = np.where(big, 1, rng.integers(1, step_size + 1, size=num_replicas))
+    for step in range(num_steps.max()):
+        idx = rng.integers(0, num_candidates, size=num_replicas)
+        dx = rng.choice([-1, 1], size=num_replicas)
+        values = proposals[replicas, idx] + dx
+        feasible = (step < num_steps) & (values <= upper(idx)) & (values >= lower(idx))
+
+        unit = feasible & ~big
+        proposals[replicas[unit], idx[unit]] = values[unit]
+
+        shifted = feasible[:, np.newaxis] & big[:, np.newaxis] & np.where(
+            (dx > 0)[:, np.newaxis],
+            np.arange(num_candidates) >= idx[:, np.newaxis],
+            np.arange(num_candidates) <= idx[:, np.newaxis])
+        proposals += shifted * dx[:, np.newaxis]
+
+    return proposals
+
+
+def parallel_tempering(
+    approvalwise_vectors: list[ApprovalwiseVector] | ApprovalwiseVectorSet,
+    niter: int = 2000,
+    num_replicas: int = 16,
+    temperatures: np.ndarray | None = None,
+    step_size: int = 1,
+    big_step_chance: float = 0.0,
+    swap_interval: int = 10,
+    seed: Optional[int] = None,
+    full_output: bool = False
+) -> tuple[ApprovalwiseVector, int] | tuple[ApprovalwiseVector, int, dict]:
+    """# Summary
+    Parallel tempering (replica exchange) for finding farthest approvalwise vector.
+
+    All replicas are kept as one `num_replicas x M` array. Every iteration draws one proposal per replica in batch,
+    made of the same moves as in `basin_hopping` (from 1 to `step_size` unit steps or a big step), scores all proposals
+    with one broadcast of the min-L1 objective and accepts each with the Metropolis criterion at the replica's
+    temperature. Every `swap_interval` iterations neighbouring temperatures exchange their states, alternating between
+    even and odd pairs, so good states found by hot replicas are refined by cold ones.
+
+    ## Args:
+        `approvalwise_vectors` (list[ApprovalwiseVector] | ApprovalwiseVectorSet): Reference approvalwise vectors.
+        `niter` (int, optional): Number of iterations. Defaults to `2000`.
+        `num_replicas` (int, optional): Number of replicas. Defaults to `16`.
+        `temperatures` (np.ndarray | None, optional): Temperature of every replica, in increasing order. Defaults to
+        a geometric ladder from `0.5` to `10`.
+        `step_size` (int, optional): For every iteration a replica can make from 1 to `step_size` unit steps. Defaults to `1`.
+        `big_step_chance` (float, optional): Chance of making a big step instead of unit steps. Defaults to `0.0`.
+        `swap_interval` (int, optional): Number of iterations between replica exchanges. Defaults to `10`.
+        `seed` (Optional[int], optional): Seed of random engine. Defaults to `None`.
+        `full_output` (bool, optional): Return also a dictionary with acceptance rates of moves `accept_rates` and of
+        exchanges `swap_rates` per temperature. Defaults to `False`.
+
+    ## Returns:
+        -> (ApprovalwiseVector, int): Farthest approvalwise vector found by any replica and its distance from given
+        approvalwise vectors.
+        -> (ApprovalwiseVector, int, dict): The same with run statistics, if `full_output` is set.
+    """
+    num_voters = approvalwise_vectors[0].num_voters
+    num_candidates = approvalwise_vectors[0].num_candidates
+    approvalwise_vectors = np.asarray(approvalwise_vectors)
+
+    rng = np.random.default_rng(seed)
+    if temperatures is None:
+        temperatures = np.geomspace(0.5, 10.0, num_replicas)
+    temperatures = np.asarray(temperatures, dtype=float)
+    num_replicas = len(temperatures)
+
+    x = __starting_replicas(approvalwise_vectors, num_voters,
+                            num_candidates, num_replicas, rng)
+    distances, best_idx = l1_across_many(x, approvalwise_vectors)
+    best_x, best_distance = x[best_idx].copy(), int(distances[best_idx])
+
+    accepted = np.zeros(num_replicas, dtype=np.int64)
+    swaps = np.zeros(num_replicas - 1, dtype=np.int64)
+    swap_attempts = np.zeros(num_replicas - 1, dtype=np.int64)
+
+    for it in range(niter):
+        proposals = __propose(x, num_voters, step_size, big_step_chance, rng)
+        proposed_distances, idx = l1_across_many(
+            proposals, approvalwise_vectors)
+        accept = (proposed_distances >= distances) | (rng.random(num_replicas) < np.exp(
+            np.minimum(proposed_distances - distances, 0) / temperatures))
+        x[accept] = proposals[accept]
+        distances[accept] = proposed_distances[accept]
+        accepted += accept
+
+        if proposed_distances[idx] > best_distance:
+            best_x, best_distance = proposals[idx].copy(), int(proposed_distances[idx])
+
+        if (it + 1) % swap_interval == 0 and num_replicas > 1:
+            lo = np.arange((it // swap_interval) % 2, num_replicas - 1, 2)
+            hi = lo + 1
+            swap_attempts[lo] += 1
+            # energy is the negated distance, so the exchange is accepted with min(1, exp(dE * dBeta))
+            log_ratio = (distances[hi] - distances[lo]) * \
+                (1 / temperatures[lo] - 1 / temperatures[hi])
+            swap = rng.random(len(lo)) < np.exp(np.minimum(log_ratio, 0))
+            lo, hi = lo[swap], hi[swap]
+            x[lo], x[hi] = x[hi], x[lo]
+            distances[lo], distances[hi] = distances[hi], distances[lo]
+            swaps[lo] += 1
+
+    vector = ApprovalwiseVector(np.array(best_x, dtype=int), num_voters)
+    if full_output:
+        return vector, best_distance, {
+            'accept_rates': accepted / max(niter, 1),
+            'swap_rates': swaps / np.maximum(swap_attempts, 1),
+        }
+    return vector, best_distance
@@ -1,7 +1,7 @@
 import mapel.elections as mapel
 import numpy as np
 from scripts.approvalwise_vector import ApprovalwiseVector, get_approvalwise_vector
-from scripts.distances import l1_across
+from scripts.distances import l1_across_many
 
 
 def find_best_starting_step_vector(approvalwise_vectors: list[ApprovalwiseVector],
@@ -9,17 +9,18 @@ def find_best_starting_step_vector(approvalwise_vectors: list[ApprovalwiseVector
     first_candidates = first_candidates if first_candidates is not None else []
     num_candidates = approvalwise_vectors[0].num_candidates
     num_voters = approvalwise_vectors[0].num_voters
-    candidates = np.ones((num_candidates + 1, num_candidates)) * num_voters
+    candidates = np.full((num_candidates + 1, num_candidates), num_voters)
     for i in range(num_candidates):
         candidates[i, i:] = 0
-    candidates = list(candidates) + list(first_candidates)
+    if len(first_candidates):
+        candidates = np.concatenate(
+            [candidates, np.asarray(first_candidates, dtype=candidates.dtype)])
     return find_best_vector(approvalwise_vectors, candidates)
 
 
 def find_best_vector(approvalwise_vectors: list[ApprovalwiseVector], candidates: list[ApprovalwiseVector]) -> ApprovalwiseVector:
-    distances = np.array(
-        [l1_across(x, np.array(approvalwise_vectors)) for x in candidates])
-    return candidates[distances.argmax()]
+    _distances, best_idx = l1_across_many(candidates, approvalwise_vectors)
+    return candidates[best_idx]
 
 
 def sample_approvalwise_vector_with_resampling(num_voters: int, num_candidates: int, rng):
@@ -0,0 +1,81 @@
+#include <boost/program_options.hpp>
+#include <iostream>
+#include <random>
+#include <vector>
+
+#include "approvalwise_vector.hpp"
+#include "greedy_dp.hpp"
+#include "two_vectors.hpp"
+
+namespace po = boost::program_options;
+
+// Randomized equivalence check of two_vectors against greedy_dp on two
+// references. Exits with 1 on the first mismatch.
+
+approvalwise_vector_t random_approvalwise_vector(const int num_voters,
+                                                 const int num_candidates,
+                                                 mt19937& gen) {
+    // few distinct values make ties, and hence tie-breaking, frequent
+    const int num_values = gen() % 4 == 0 ? 3 : num_voters + 1;
+    vi values(num_values);
+    for (auto& value : values) {
+        value = gen() % (num_voters + 1);
+    }
+    approvalwise_vector_t vector(num_candidates);
+    for (auto& a : vector) {
+        a = values[gen() % num_values];
+    }
+    sort(vector.rbegin(), vector.rend());
+    return vector;
+}
+
+signed main(int argc, char** argv) {
+    po::options_description desc("Allowed options");
+    desc.add_options()("help", "produce help message")(
+        "trials", po::value<int>()->default_value(10000), "number of trials")(
+        "max-voters", po::value<int>()->default_value(60),
+        "maximum number of voters")(
+        "max-candidates", po::value<int>()->default_value(30),
+        "maximum number of candidates")(
+        "seed", po::value<int>()->default_value(0), "random seed");
+
+    po::variables_map vm;
+    try {
+        po::store(po::parse_command_line(argc, argv, desc), vm);
+        po::notify(vm);
+    } catch (const po::error& e) {
+        std::cerr << "Error: " << e.what() << std::endl;
+        return 1;
+    }
+
+    if (vm.count("help")) {
+        std::cout << desc << "\n";
+        return 1;
+    }
+
+    const int trials = vm["trials"].as<int>();
+    const int max_voters = vm["max-voters"].as<int>();
+    const int max_candidates = vm["max-candidates"].as<int>();
+    mt19937 gen(vm["seed"].as<int>());
+
+    for (int trial = 0; trial < trials; trial++) {
+        const int N = 1 + gen() % max_voters;
+        const int M = 1 + gen() % max_candidates;
+        const auto first = random_approvalwise_vector(N, M, gen);
+        const auto second = random_approvalwise_vector(N, M, gen);
+
+        const auto expected =
+            greedy_dp::farthest_approvalwise_vector({first, second}, N, 1);
+        const auto actual =
+            two_vectors::farthest_approvalwise_vector(first, second, N);
+        if (expected != actual) {
+            cout << "Mismatch for N=" << N << ", M=" << M << ": ";
+            print_vec(first);
+            cout << ' ';
+            print_vec(second);
+            cout << endl;
+            return 1;
+        }
+    }
+    cout << trials << " trials OK" << endl;
+}
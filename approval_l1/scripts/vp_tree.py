@@ -0,0 +1,178 @@
+from typing import Iterable
+
+import numpy as np
+from scripts.approvalwise_vector import ApprovalwiseVector
+
+
+class _Leaf:
+    __slots__ = ('indices',)
+
+    def __init__(self, indices: list[int]):
+        self.indices = indices
+
+
+class _Node:
+    __slots__ = ('vantage', 'radius', 'inside', 'outside')
+
+    def __init__(self, vantage: int, radius: int, inside, outside):
+        self.vantage = vantage
+        self.radius = radius
+        self.inside = inside
+        self.outside = outside
+
+
+class VPTree:
+    """# Summary
+    Exact L1 nearest neighbour index (vantage-point tree) over approvalwise vectors.
+
+    Every inner node splits its points by their distance to a vantage point: points not farther than `radius` go
+    `inside`, the rest go `outside`. Queries use the triangle inequality to skip whole subtrees, while leaves of
+    up to `leaf_size` points are scanned with a single vectorized distance computation.
+
+    Inserted points descend to a leaf, which is rebuilt into a subtree once it grows past twice `leaf_size`,
+    so the split invariant, and hence exactness, is preserved without rebuilding the whole tree.
+
+    ## Args:
+        `approvalwise_vectors` (Iterable[ApprovalwiseVector]): Initial vectors, built in bulk.
+        `leaf_size` (int, optional): Maximum number of points scanned by brute force in a leaf. Defaults to `32`.
+        `seed` (int | None, optional): Seed used to pick vantage points. Defaults to `None`.
+        `num_candidates` (int | None, optional): Length of vectors, required only for an initially empty tree.
+    """
+
+    def __init__(self, approvalwise_vectors: Iterable[ApprovalwiseVector] = (), leaf_size: int = 32,
+                 seed: int | None = None, num_candidates: int | None = None):
+        approvalwise_vectors = np.asarray(
+            list(approvalwise_vectors), dtype=np.int32)
+        if num_candidates is None:
+            if len(approvalwise_vectors) == 0:
+                raise ValueError(
+                    'Cannot infer number of candidates from an empty tree')
+            num_candidates = approvalwise_vectors.shape[1]
+
+        self._leaf_size = leaf_size
+        self._rng = np.random.default_rng(seed)
+        self._size = len(approvalwise_vectors)
+        self._data = np.zeros(
+            (max(self._size, 16), num_candidates), dtype=np.int32)
+        self._data[:self._size] = approvalwise_vectors
+        self._root = self._build(list(range(self._size)))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __array__(self, dtype=None):
+        return self.vectors if dtype is None else self.vectors.astype(dtype)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._data[:self._size]
+
+    def _distances(self, x: np.ndarray, indices: list[int]) -> np.ndarray:
+        return np.sum(np.abs(self._data[indices] - x), axis=1)
+
+    def _build(self, indices: list[int]):
+        if len(indices) <= self._leaf_size:
+            return _Leaf(indices)
+
+        vantage = indices[self._rng.integers(len(indices))]
+        rest = np.array([idx for idx in indices if idx != vantage])
+        distances = self._distances(self._data[vantage], rest)
+        radius = int(np.median(distances))
+        inside = rest[distances <= radius]
+        outside = rest[distances > radius]
+        if len(outside) == 0:
+            return _Leaf(indices)
+
+        return _Node(vantage, radius, self._build(inside.tolist()), self._build(outside.tolist()))
+
+    def insert(self, approvalwise_vector: ApprovalwiseVector) -> int:
+        """Inserts a vector and returns its index."""
+        if self._size == len(self._data):
+            self._data = np.concatenate(
+                [self._data, np.zeros_like(self._data)], axis=0)
+        idx = self._size
+        self._data[idx] = approvalwise_vector
+        self._size += 1
+        x = self._data[idx]
+
+        parent, node = None, self._root
+        while isinstance(node, _Node):
+            parent = node
+            distance = int(np.sum(np.abs(self._data[node.vantage] - x)))
+            node = node.inside if distance <= node.radius else node.outside
+
+        node.indices.append(idx)
+        if len(node.indices) > 2 * self._leaf_size:
+            subtree = self._build(node.indices)
+            if parent is None:
+                self._root = subtree
+            elif parent.inside is node:
+                parent.inside = subtree
+            else:
+                parent.outside = subtree
+        return idx
+
+    def extend(self, approvalwise_vectors: Iterable[ApprovalwiseVector]) -> None:
+        for approvalwise_vector in approvalwise_vectors:
+            self.insert(approvalwise_vector)
+
+    def nearest(self, x: ApprovalwiseVector) -> tuple[int, int]:
+        """Returns index of the nearest vector and its L1 distance to `x`."""
+        x = np.asarray(x)
+        best_idx, best_distance = -1, np.iinfo(np.int64).max
+
+        stack = [(self._root, 0)]
+        while stack:
+            node, lower_bound = stack.pop()
+            if lower_bound >= best_distance:
+                continue
+
+            if isinstance(node, _Leaf):
+                if not node.indices:
+                    continue
+                distances = self._distances(x, node.indices)
+                i = int(distances.argmin())
+                if distances[i] < best_distance:
+                    best_idx, best_distance = node.indices[i], int(
+                        distances[i])
+                continue
+
+            distance = int(np.sum(np.abs(self._data[node.vantage] - x)))
+            if distance < best_distance:
+                best_idx, best_distance = node.vantage, distance
+
+            inside_bound = max(lower_bound, distance - node.radius)
+            outside_bound = max(lower_bound, node.radius - distance)
+            if distance <= node.radius:
+                stack.append((node.outside, outside_bound))
+                stack.append((node.inside, inside_bound))
+            else:
+                stack.append((node.inside, inside_bound))
+                stack.append((node.outside, outside_bound))
+
+        return best_idx, best_distance
+
+    def within(self, x: ApprovalwiseVector, radius: int) -> np.ndarray:
+        """Returns indices of all vectors within L1 distance `radius` from `x`."""
+        x = np.asarray(x)
+        found = []
+
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, _Leaf):
+                if node.indices:
+                    distances = self._distances(x, node.indices)
+                    found.extend(np.asarray(node.indices)[
+                                 distances <= radius].tolist())
+                continue
+
+            distance = int(np.sum(np.abs(self._data[node.vantage] - x)))
+            if distance <= radius:
+                found.append(node.vantage)
+            if distance - radius <= node.radius:
+                stack.append(node.inside)
+            if distance + radius > node.radius:
+                stack.append(node.outside)
+
+        return np.sort(np.array(found, dtype=int))
@@ -46,6 +46,40 @@ int dist_l1(const approvalwise_vector_t& a, const approvalwise_vector_t& b) {
     return dist;
 }
 
+ReferenceMatrix::ReferenceMatrix(const int num_candidates)
+    : num_references(0), num_candidates(num_candidates), capacity(0) {}
+
+ReferenceMatrix::ReferenceMatrix(
+    const vector<approvalwise_vector_t>& approvalwise_vectors)
+    : num_references(approvalwise_vectors.size()),
+      num_candidates(approvalwise_vectors.front().size()),
+      capacity(num_references),
+      data(num_references * num_candidates) {
+    for (int r = 0; r < num_references; r++) {
+        for (int x = 0; x < num_candidates; x++) {
+            data[x * capacity + r] = approvalwise_vectors[r][x];
+        }
+    }
+}
+
+void ReferenceMatrix::append(const approvalwise_vector_t& approvalwise_vector) {
+    if (num_references == capacity) {
+        const int new_capacity = max(16, 2 * capacity);
+        vi new_data(new_capacity * num_candidates);
+        for (int x = 0; x < num_candidates; x++) {
+            copy(data.begin() + x * capacity,
+                 data.begin() + x * capacity + num_references,
+                 new_data.begin() + x * new_capacity);
+        }
+        data.swap(new_data);
+        capacity = new_capacity;
+    }
+    for (int x = 0; x < num_candidates; x++) {
+        data[x * capacity + num_references] = approvalwise_vector[x];
+    }
+    num_references++;
+}
+
 int score_across(const vector<approvalwise_vector_t>& votings_hist,
                  const approvalwise_vector_t& voting, const int num_voters) {
     const int num_candidates = votings_hist.front().size();
@@ -56,6 +90,24 @@ int score_across(const vector<approvalwise_vector_t>& votings_hist,
     return min_score;
 }
 
+int score_across(const ReferenceMatrix& references,
+                 const approvalwise_vector_t& voting, const int num_voters) {
+    const int num_references = references.num_references;
+    vi dists(num_references, 0);
+    for (int x = 0; x < references.num_candidates; x++) {
+        const int* column = references.column(x);
+        const int value = voting[x];
+        for (int r = 0; r < num_references; r++) {
+            dists[r] += abs(value - column[r]);
+        }
+    }
+    int min_score = references.num_candidates * num_voters + 1;
+    for (int r = 0; r < num_references; r++) {
+        min_score = min(min_score, dists[r]);
+    }
+    return min_score;
+}
+
 void print_vec(const vector<int>& v) {
     cout << "[";
     if (v.size()) {
@@ -0,0 +1,172 @@
+#include "basin_hopping.hpp"
+
+#include <algorithm>
+#include <cmath>
+#include <random>
+#include <vector>
+
+#include "approvalwise_vector.hpp"
+
+namespace basin_hopping {
+
+namespace {
+// Lattice state with distances to every reference, kept up to date by moves.
+struct State {
+    vi x;
+    vi distances;
+    int min_distance;
+};
+
+class Engine {
+   public:
+    Engine(const vector<approvalwise_vector_t>& approvalwise_vectors,
+           const int num_voters, const uint64_t seed)
+        : R(approvalwise_vectors.size()),
+          M(approvalwise_vectors.front().size()),
+          N(num_voters),
+          columns(M * R),
+          rng(seed) {
+        // candidate-major, so that a move on one coordinate reads R
+        // consecutive values
+        for (int r = 0; r < R; r++) {
+            for (int i = 0; i < M; i++) {
+                columns[i * R + r] = approvalwise_vectors[r][i];
+            }
+        }
+    }
+
+    State make_state(const approvalwise_vector_t& x) const {
+        State state{x, vi(R, 0), 0};
+        for (int i = 0; i < M; i++) {
+            const int* column = &columns[i * R];
+            for (int r = 0; r < R; r++) {
+                state.distances[r] += abs(x[i] - column[r]);
+            }
+        }
+        state.min_distance = *min_element(all(state.distances));
+        return state;
+    }
+
+    // Same move set as `scripts/basin_hopping.py`: either a big step, or
+    // from 1 to `step_size` unit steps.
+    void step(State& state, const int step_size,
+              const double big_step_chance) {
+        if (uniform(rng) < big_step_chance) {
+            big_step(state);
+        } else {
+            const int steps =
+                std::uniform_int_distribution<int>(1, step_size)(rng);
+            for (int s = 0; s < steps; s++) {
+                unit_step(state);
+            }
+        }
+        state.min_distance = *min_element(all(state.distances));
+    }
+
+    bool accept(const int old_distance, const int new_distance) {
+        // Metropolis criterion at temperature 1 on the negated distance, as
+        // in scipy.optimize.basinhopping
+        if (new_distance >= old_distance) return true;
+        return uniform(rng) <= std::exp(new_distance - old_distance);
+    }
+
+   private:
+    int upper(const vi& x, const int idx) const {
+        return idx == 0 ? N : x[idx - 1];
+    }
+
+    int lower(const vi& x, const int idx) const {
+        return idx == M - 1 ? 0 : x[idx + 1];
+    }
+
+    int random_direction() { return coin(rng) ? 1 : -1; }
+
+    // With N > 0 either the first coordinate can grow, the last can drop, or
+    // some coordinate is above the next one, so both move types have a
+    // feasible move. With N = 0 the only vector is zero.
+    bool has_moves() const { return N > 0; }
+
+    void unit_step(State& state) {
+        if (!has_moves()) return;
+        auto& x = state.x;
+        while (true) {
+            const int idx = coordinate(rng);
+            const int dx = random_direction();
+            if (upper(x, idx) >= x[idx] + dx && x[idx] + dx >= lower(x, idx)) {
+                const int* column = &columns[idx * R];
+                for (int r = 0; r < R; r++) {
+                    state.distances[r] += abs(x[idx] + dx - column[r]) -
+                                          abs(x[idx] - column[r]);
+                }
+                x[idx] += dx;
+                return;
+            }
+        }
+    }
+
+    void shift(State& state, const int lo, const int hi, const int dx) {
+        auto& x = state.x;
+        for (int i = lo; i < hi; i++) {
+            const int* column = &columns[i * R];
+            for (int r = 0; r < R; r++) {
+                const bool moving_away = dx > 0 ? x[i] >= column[r]
+                                                : x[i] <= column[r];
+                state.distances[r] += moving_away ? 1 : -1;
+            }
+            x[i] += dx;
+        }
+    }
+
+    void big_step(State& state) {
+        if (!has_moves()) return;
+        auto& x = state.x;
+        while (true) {
+            const int idx = coordinate(rng);
+            const int dx = random_direction();
+            if (dx > 0 && upper(x, idx) >= x[idx] + dx) {
+                shift(state, idx, M, dx);
+                return;
+            } else if (dx < 0 && x[idx] + dx >= lower(x, idx)) {
+                shift(state, 0, idx + 1, dx);
+                return;
+            }
+        }
+    }
+
+    const int R;
+    const int M;
+    const int N;
+    vi columns;
+    std::mt19937_64 rng;
+    std::uniform_real_distribution<double> uniform{0.0, 1.0};
+    std::uniform_int_distribution<int> coordinate{0, M - 1};
+    std::bernoulli_distribution coin{0.5};
+};
+}  // namespace
+
+pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
+    const vector<approvalwise_vector_t>& approvalwise_vectors,
+    const int num_voters, const approvalwise_vector_t& x0, const long long niter,
+    const int step_size, const double big_step_chance, const uint64_t seed) {
+    Engine engine(approvalwise_vectors, num_voters, seed);
+
+    State current = engine.make_state(x0);
+    State best = current;
+    State proposal = current;
+
+    for (long long it = 0; it < niter; it++) {
+        proposal.x = current.x;
+        proposal.distances = current.distances;
+        engine.step(proposal, step_size, big_step_chance);
+
+        if (engine.accept(current.min_distance, proposal.min_distance)) {
+            std::swap(current, proposal);
+            if (current.min_distance > best.min_distance) {
+                best = current;
+            }
+        }
+    }
+
+    return {best.x, best.min_distance};
+}
+}  // namespace basin_hopping
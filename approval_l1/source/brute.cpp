@@ -1,127 +1,222 @@
+#include "brute.hpp"
+
 #include <algorithm>
+#include <numeric>
 #include <vector>
 
 #include "approvalwise_vector.hpp"
 #include "definitions.hpp"
+#include "greedy_dp.hpp"
 
 namespace brute {
 
+static constexpr int BEAM_WIDTH = 16;
+
 namespace {
-struct Node {
-    int from_y = -1;
-    int from_idx = -1;
-    int min_dist = 0;
-    std::vector<int> single_dists;
-
-    bool operator<=(const Node& rhs) const {
-        if (rhs.single_dists.empty()) return true;
-        if (single_dists.empty()) return false;
-        for (size_t i = 0; i < single_dists.size(); i++) {
-            if (single_dists[i] > rhs.single_dists[i]) return false;
-        }
-        return true;
-    }
+// Labels of one column in a pool: label `i` holds the distances to every
+// reference in `dists[i * R, (i + 1) * R)`, its height and the index of its
+// predecessor in the pool of the previous column. Labels of height y are
+// stored in `[begin[y], end[y])`.
+struct Layer {
+    vi dists;
+    vi sums;
+    vi heights;
+    vi from;
+    vi begin;
+    vi end;
+
+    explicit Layer(const int N) : begin(N + 1), end(N + 1) {}
+
+    int size() const { return heights.size(); }
 };
 
-struct Cell {
-    std::vector<Node> nodes;
-};
-}  // namespace
+bool dominates(const int* lhs, const int* rhs, const int R) {
+    for (int r = 0; r < R; r++) {
+        if (lhs[r] < rhs[r]) return false;
+    }
+    return true;
+}
 
-void remove_non_maximal(std::vector<Node>& nodes) {}
+void remove_non_maximal(const vi& dists, const vi& sums, const int R,
+                        vi& skyline, const vi& incoming) {
+    // Sort-filter skyline: a label can be dominated only by one with a not
+    // smaller sum, so after sorting by decreasing sum every label is checked
+    // against the kept ones only. `skyline` and `incoming` are maximal on
+    // their own, so only labels from the other side need to be checked.
+    const int num_skyline = skyline.size();
+    vector<pair<int, bool>> order;
+    order.reserve(num_skyline + incoming.size());
+    for (const int idx : skyline) order.push_back({idx, false});
+    for (const int idx : incoming) order.push_back({idx, true});
+    stable_sort(all(order), [&sums](const auto& lhs, const auto& rhs) {
+        return sums[lhs.first] > sums[rhs.first];
+    });
+
+    vi kept[2];
+    for (const auto& [idx, is_incoming] : order) {
+        const int* label = &dists[idx * R];
+        const bool dominated =
+            any_of(all(kept[!is_incoming]), [&](const int other) {
+                return dominates(&dists[other * R], label, R);
+            });
+        if (!dominated) {
+            kept[is_incoming].push_back(idx);
+        }
+    }
 
-pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
-    const std::vector<approvalwise_vector_t>& votings_hist, const int N) {
-    const int R = votings_hist.size();
-    const int M = votings_hist.front().size();
+    skyline = kept[false];
+    skyline.insert(skyline.end(), all(kept[true]));
+}
 
-    std::vector<std::vector<Cell>> cells(M, std::vector<Cell>(N + 1));
+// Upper bound of the distance of any completion of a label, given the
+// farthest distance to every reference on its own from the label's cell on.
+int bound(const int* dists, const int* reach, const int R) {
+    int result = INT32_MAX;
+    for (int r = 0; r < R; r++) {
+        result = min(result, (dists ? dists[r] : 0) + reach[r]);
+    }
+    return result;
+}
 
-    {
-        int x = 0;
-        for (int y = N; y >= 0; --y) {
-            Node node;
-            for (int r = 0; r < R; r++) {
-                node.single_dists.push_back(abs(y - votings_hist[r][x]));
+// Farthest distance to every reference on its own over completions of a
+// prefix ending at height y in column x, as a flat `M x (N + 1) x R` table.
+vi farthest_completions(const ReferenceMatrix& references, const int N) {
+    const int R = references.num_references;
+    const int M = references.num_candidates;
+    vi rest(M * (N + 1) * R, 0);
+    for (int x = M - 2; x >= 0; x--) {
+        const int* column = references.column(x + 1);
+        for (int r = 0; r < R; r++) {
+            int best = 0;
+            for (int y = 0; y <= N; y++) {
+                best = max(best, abs(y - column[r]) +
+                                     rest[((x + 1) * (N + 1) + y) * R + r]);
+                rest[(x * (N + 1) + y) * R + r] = best;
             }
-            // node.min_dist = *min_element(all(node.single_dists));
-            cells[x][y].nodes.push_back(node);
         }
     }
-    for (int x = 1; x < M; x++) {
+    return rest;
+}
+
+// Labels whose bound does not beat `incumbent` are dropped, and `incumbent`
+// is returned when no label does. With `max_labels > 0` only that many labels
+// with the highest bounds are kept per cell, which is no longer exact.
+pair<approvalwise_vector_t, int> search(
+    const ReferenceMatrix& references, const vi& rest, const int N,
+    const pair<approvalwise_vector_t, int>& incumbent, const int max_labels) {
+    const int R = references.num_references;
+    const int M = references.num_candidates;
+
+    vector<Layer> layers;
+    layers.reserve(M);
+    for (int x = 0; x < M; x++) {
+        const int* column = references.column(x);
+        const int* prev_dists = x == 0 ? nullptr : layers.back().dists.data();
+        Layer layer(N);
+        // -1 is the empty prefix before the first column
+        vi skyline = x == 0 ? vi{-1} : vi{};
+        vector<pair<int, int>> bounds;
+        vi reach(R);
         for (int y = N; y >= 0; --y) {
-            const int x_prev = x - 1;
-            for (int y_prev = N; y_prev >= y; --y_prev) {
-                const auto& prev_cell = cells[x_prev][y_prev];
-                for (int idx = 0; idx < (int)prev_cell.nodes.size(); ++idx) {
-                    const auto& prev_node = prev_cell.nodes[idx];
-                    Node node;
-                    node.from_y = y_prev;
-                    node.from_idx = idx;
-                    for (int r = 0; r < R; r++) {
-                        node.single_dists.push_back(
-                            abs(y - votings_hist[r][x]) +
-                            prev_node.single_dists[r]);
-                    }
-                    cells[x][y].nodes.push_back(node);
+            if (x > 0) {
+                // the best completion of a label of the previous column
+                // through any height up to y is bounded by its own
+                // rest(x - 1, y), so labels failing it leave the skyline
+                const int* prev_rest_y = &rest[((x - 1) * (N + 1) + y) * R];
+                skyline.erase(remove_if(all(skyline),
+                                        [&](const int from) {
+                                            return bound(&prev_dists[from * R],
+                                                         prev_rest_y, R) <=
+                                                   incumbent.second;
+                                        }),
+                              skyline.end());
+
+                const Layer& prev = layers.back();
+                vi incoming(prev.end[y] - prev.begin[y]);
+                iota(all(incoming), prev.begin[y]);
+                remove_non_maximal(prev.dists, prev.sums, R, skyline,
+                                   incoming);
+            }
+
+            // farthest distance to every reference from height y on
+            const int* rest_y = &rest[(x * (N + 1) + y) * R];
+            for (int r = 0; r < R; r++) {
+                reach[r] = abs(y - column[r]) + rest_y[r];
+            }
+            bounds.clear();
+            for (const int from : skyline) {
+                const int label_bound = bound(
+                    from < 0 ? nullptr : &prev_dists[from * R], reach.data(), R);
+                if (label_bound > incumbent.second) {
+                    bounds.push_back({-label_bound, from});
                 }
             }
+            if (max_labels > 0 && (int)bounds.size() > max_labels) {
+                nth_element(bounds.begin(), bounds.begin() + max_labels,
+                            bounds.end());
+                bounds.resize(max_labels);
+            }
 
-            auto& cell = cells[x][y];
-
-            // remove_if(all(cell.nodes), )
-
-            std::vector<Node> maximal_nodes;
-            std::copy_if(
-                all(cell.nodes), back_inserter(maximal_nodes),
-                [&cell](const auto& node) {
-                    return none_of(
-                        all(cell.nodes), [&node](const auto& other_node) {
-                            if (other_node.single_dists.size() !=
-                                node.single_dists.size()) {
-                                return false;
-                            }
-                            bool all_greater = true;
-                            for (size_t i = 0; i < node.single_dists.size();
-                                 i++) {
-                                all_greater &= other_node.single_dists[i] >
-                                               node.single_dists[i];
-                            }
-                            return all_greater;
-                        });
-                });
-            cell.nodes = maximal_nodes;
+            layer.begin[y] = layer.size();
+            for (const auto& [_bound, from] : bounds) {
+                int sum = 0;
+                for (int r = 0; r < R; r++) {
+                    const int dist = abs(y - column[r]) +
+                                     (from < 0 ? 0 : prev_dists[from * R + r]);
+                    layer.dists.push_back(dist);
+                    sum += dist;
+                }
+                layer.sums.push_back(sum);
+                layer.heights.push_back(y);
+                layer.from.push_back(from);
+            }
+            layer.end[y] = layer.size();
         }
+        layers.push_back(move(layer));
     }
 
-    std::vector<Node> backs_maxs(N + 1);
-
-    for (int y = 0; y < N + 1; y++) {
-        auto& cell = cells.back()[y];
-        for (auto& node : cell.nodes) {
-            node.min_dist = *std::min_element(all(node.single_dists));
+    const Layer& last = layers.back();
+    int best_idx = -1, best_dist = -1;
+    for (int idx = 0; idx < last.size(); idx++) {
+        const int dist = *min_element(&last.dists[idx * R],
+                                      &last.dists[(idx + 1) * R]);
+        if (dist > best_dist) {
+            best_dist = dist;
+            best_idx = idx;
         }
-        auto it =
-            std::max_element(all(cell.nodes), [](const auto& l, const auto& r) {
-                return l.min_dist < r.min_dist;
-            });
-        backs_maxs[y] = *it;
     }
 
-    auto max_el = max_element(
-        all(backs_maxs),
-        [](const auto& l, const auto& r) { return l.min_dist < r.min_dist; });
-    approvalwise_vector_t res(M);
-    int y = max_el - backs_maxs.begin();
-    Node node = *max_el;
+    if (best_idx < 0) {
+        return incumbent;
+    }
 
-    res.back() = y;
-    for (int x = M - 2; x >= 0; x--) {
-        y = node.from_y;
-        node = cells[x][y].nodes[node.from_idx];
-        res[x] = y;
+    approvalwise_vector_t res(M);
+    for (int x = M - 1, idx = best_idx; x >= 0; x--) {
+        res[x] = layers[x].heights[idx];
+        idx = layers[x].from[idx];
     }
 
-    return {res, max_el->min_dist};
+    return {res, best_dist};
+}
+}  // namespace
+
+pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
+    const std::vector<approvalwise_vector_t>& votings_hist, const int N) {
+    const ReferenceMatrix references(votings_hist);
+    const vi rest = farthest_completions(references, N);
+
+    // Only maximal labels of a cell are kept: the objective min_r dist_r is
+    // monotone, so a label dominated in every reference never leads to a
+    // farther vector. All labels entering cell (x, y) come from cells
+    // (x - 1, y') with y' >= y and are shifted by the same costs, so the
+    // maximal labels of the cell are the skyline of the union of these cells,
+    // maintained incrementally while y decreases.
+    //
+    // A label is also dropped when even the farthest completion for every
+    // reference on its own cannot beat the best vector known so far: the
+    // greedy DP one, improved by a beam search over the same labels.
+    auto incumbent = greedy_dp::farthest_approvalwise_vector(votings_hist, N);
+    incumbent = search(references, rest, N, incumbent, BEAM_WIDTH);
+    return search(references, rest, N, incumbent, 0);
 }
 }  // namespace brute
@@ -4,42 +4,64 @@
 #include <vector>
 
 #include "approvalwise_vector.hpp"
+#include "utils.hpp"
 
 using namespace std;
 
 namespace greedy_dp {
 
-pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
-    const vector<approvalwise_vector_t>& approvalwise_vectors,
-    const int voters_num) {
-    const int elections_num = approvalwise_vectors.size();
-    const int candidates_num = approvalwise_vectors.front().size();
+static constexpr long long MIN_PARALLEL_COLUMN_WORK = 1 << 20;
+
+vector<pair<approvalwise_vector_t, int>> farthest_approvalwise_vectors(
+    const ReferenceMatrix& references, const int voters_num,
+    const int max_results, int num_threads) {
+    const int elections_num = references.num_references;
+    const int candidates_num = references.num_candidates;
+    const int heights_num = voters_num + 1;
     const int INF = voters_num * candidates_num + 1;
 
-    vvvi dp_per_voting(candidates_num,
-                       vvi(voters_num + 1, vi(elections_num, 0)));
-    vvi dp(candidates_num, vi(voters_num + 1, 0));
-    vvi from(candidates_num, vi(voters_num + 1, -1));
+    // Distances per reference of the best prefix ending at height y are kept
+    // only for the previous and the current column, as flat `heights_num x
+    // elections_num` layers. `cost` holds |y - a_r[x]| of the current column.
+    vi dp_prev(heights_num * elections_num);
+    vi dp_cur(heights_num * elections_num);
+    vi cost(heights_num * elections_num);
+    vi from(candidates_num * heights_num, -1);
 
-    for (int y = voters_num; y >= 0; --y) {
-        const int x = 0;
-        for (int r = 0; r < elections_num; r++) {
-            dp_per_voting[x][y][r] = abs(y - approvalwise_vectors[r][x]);
+    const auto fill_cost = [&](const int x) {
+        const int* column = references.column(x);
+        for (int y = 0; y < heights_num; y++) {
+            int* cost_y = &cost[y * elections_num];
+            for (int r = 0; r < elections_num; r++) {
+                cost_y[r] = abs(y - column[r]);
+            }
         }
-        dp[x][y] = *min_element(all(dp_per_voting[x][y]));
+    };
+
+    fill_cost(0);
+    copy(all(cost), dp_cur.begin());
+
+    // Heights of one column depend only on the previous column, so they are
+    // split across threads. A column costs about N^2 * R / 2 operations and
+    // small problems are not worth spawning threads for.
+    const long long column_work =
+        1LL * heights_num * heights_num * elections_num / 2;
+    if (column_work < MIN_PARALLEL_COLUMN_WORK) {
+        num_threads = 1;
     }
 
     for (int x = 1; x < candidates_num; x++) {
-        for (int y = voters_num; y >= 0; --y) {
+        swap(dp_prev, dp_cur);
+        fill_cost(x);
+        parallel_for(0, heights_num, num_threads, [&](const int y) {
+            const int* cost_y = &cost[y * elections_num];
             int max_y = -1;
             int max_for_y = -1;
-            const int x_prev = x - 1;
             for (int y_prev = voters_num; y_prev >= y; y_prev--) {
+                const int* prev = &dp_prev[y_prev * elections_num];
                 int min_for_r = INF;
                 for (int r = 0; r < elections_num; r++) {
-                    const int val = abs(y - approvalwise_vectors[r][x]) +
-                                    dp_per_voting[x_prev][y_prev][r];
-                    min_for_r = min(min_for_r, val);
+                    min_for_r = min(min_for_r, cost_y[r] + prev[r]);
                 }
                 if (min_for_r > max_for_y) {
                     max_for_y = min_for_r;
@@ -47,45 +69,63 @@ pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
                 }
             }
 
+            const int* prev = &dp_prev[max_y * elections_num];
+            int* cur = &dp_cur[y * elections_num];
             for (int r = 0; r < elections_num; r++) {
-                dp_per_voting[x][y][r] = abs(y - approvalwise_vectors[r][x]) +
-                                         dp_per_voting[x_prev][max_y][r];
+                cur[r] = cost_y[r] + prev[r];
             }
+            from[x * heights_num + y] = max_y;
+        });
+    }
 
-            dp[x][y] = *min_element(all(dp_per_voting[x][y]));
-            from[x][y] = max_y;
-        }
+    // Terminal heights by their distance, the lowest height first on ties.
+    vi dists(heights_num);
+    for (int y_last = 0; y_last < heights_num; y_last++) {
+        const int* last = &dp_cur[y_last * elections_num];
+        dists[y_last] = *min_element(last, last + elections_num);
+    }
+    vi terminals(heights_num);
+    for (int y_last = 0; y_last < heights_num; y_last++) {
+        terminals[y_last] = y_last;
     }
+    stable_sort(all(terminals),
+                [&](const int l, const int r) { return dists[l] > dists[r]; });
+    terminals.resize(min(max_results, heights_num));
 
-    approvalwise_vector_t res(candidates_num);
-    auto max_el = max_element(all(dp.back()));
-    int y = max_el - dp.back().begin();
-    res.back() = y;
-    for (int x = candidates_num - 2; x >= 0; x--) {
-        y = from[x + 1][y];
-        res[x] = y;
+    vector<pair<approvalwise_vector_t, int>> results;
+    for (int y : terminals) {
+        approvalwise_vector_t res(candidates_num);
+        res.back() = y;
+        const int dist = dists[y];
+        for (int x = candidates_num - 2; x >= 0; x--) {
+            y = from[(x + 1) * heights_num + y];
+            res[x] = y;
+        }
+        results.push_back({res, dist});
     }
+    return results;
+}
+
+vector<pair<approvalwise_vector_t, int>> farthest_approvalwise_vectors(
+    const vector<approvalwise_vector_t>& approvalwise_vectors,
+    const int voters_num, const int max_results, int num_threads) {
+    return farthest_approvalwise_vectors(ReferenceMatrix(approvalwise_vectors),
+                                         voters_num, max_results, num_threads);
+}
 
-    // for (int y = N; y >= 0; y--) {
-    //   cout << setw(2) << setfill('0') << y << ": ";
-    //   cout << "[";
-    //   cout << setw(3) << setfill('0') << dp[0][y];
-    //   for (size_t i = 1; i < M; i++) {
-    //     cout << ", " << setw(3) << setfill('0') << dp[i][y];
-    //   }
-    //   cout << "]\n";
-    // }
-    // for (int y = N; y >= 0; y--) {
-    //   cout << setw(2) << setfill('0') << y << ": ";
-    //   cout << "[";
-    //   cout << setw(2) << setfill('0') << from[0][y];
-    //   for (size_t i = 1; i < M; i++) {
-    //     cout << ", " << setw(2) << setfill('0') << from[i][y];
-    //   }
-    //   cout << "]\n";
-    // }
-
-    return {res, *max_el};
+pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
+    const ReferenceMatrix& references, const int voters_num,
+    int num_threads) {
+    return farthest_approvalwise_vectors(references, voters_num, 1,
+                                         num_threads)
+        .front();
+}
+
+pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
+    const vector<approvalwise_vector_t>& approvalwise_vectors,
+    const int voters_num, int num_threads) {
+    return farthest_approvalwise_vector(ReferenceMatrix(approvalwise_vectors),
+                                        voters_num, num_threads);
 }
 }  // namespace greedy_dp
 
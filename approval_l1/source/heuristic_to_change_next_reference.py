@@ -1,13 +1,9 @@
 import time
 import typing
-import numpy as np
 import pandas as pd
 from scripts.approvalwise_vector import ApprovalwiseVector
 from scripts.algorithms import Algorithm
-
-
-def __distance_across(approvalwise_vectors: np.ndarray, x: ApprovalwiseVector) -> int:
-    return np.sum(np.abs(approvalwise_vectors - x), axis=1).min()
+from scripts.distances import ApprovalSumIndex
 
 
 def measure_iteration(approvalwise_vectors: list[ApprovalwiseVector], algorithm: Algorithm, **kwargs):
@@ -24,6 +20,8 @@ def heuristic_to_change_next_reference(initial_approvalwise_vectors: list[Approv
                                        num_generated: int, csv_report_out: typing.TextIO, num_trials: int = 1, **heuristic_kwargs):
 
     approvalwise_vectors = initial_approvalwise_vectors[:]
+    # trials extend copies of the index, which is built from scratch only once
+    approvalwise_index = ApprovalSumIndex(approvalwise_vectors)
     new_reference_approvalwise_vectors = []
     new_heuristic_approvalwise_vectors = []
 
@@ -44,10 +42,12 @@ def heuristic_to_change_next_reference(initial_approvalwise_vectors: list[Approv
         csv_report_out.write(','.join(map(str, report_row)) + '\n')
 
         new_approvalwise_vectors = None
+        new_approvalwise_index = None
 
         for i_trial in range(num_trials):
             i_heuristic = 0
             trial_approvalwise_vectors = approvalwise_vectors[:]
+            trial_index = approvalwise_index.copy()
             while True:
                 new_heuristic_approvalwise_vector, heuristic_distance, dt = measure_iteration(
                     trial_approvalwise_vectors, heuristic_algorithm, **heuristic_kwargs)
@@ -59,13 +59,16 @@ def heuristic_to_change_next_reference(initial_approvalwise_vectors: list[Approv
 
                 trial_approvalwise_vectors.append(
                     new_heuristic_approvalwise_vector)
+                trial_index.insert(new_heuristic_approvalwise_vector)
 
                 report_row = (i_generated, heuristic_distance, reference_distance,
                               i_heuristic, i_trial, dt, 'heuristic')
                 csv_report_out.write(','.join(map(str, report_row)) + '\n')
 
                 i_heuristic += 1
-                if __distance_across(trial_approvalwise_vectors, new_reference_approvalwise_vector) < reference_distance:
+                if trial_index.min_distance(new_reference_approvalwise_vector, stop_below=reference_distance) < reference_distance:
                     break
             new_approvalwise_vectors = trial_approvalwise_vectors
+            new_approvalwise_index = trial_index
         approvalwise_vectors = new_approvalwise_vectors
+        approvalwise_index = new_approvalwise_index
@@ -4,16 +4,13 @@ import numpy as np
 import pandas as pd
 from scripts.approvalwise_vector import ApprovalwiseVector
 from scripts.algorithms import Algorithm
+from scripts.distances import DistanceIndex
 
 
 def __distance_across(approvalwise_vectors: np.ndarray, x: ApprovalwiseVector) -> int:
     return int(np.sum(np.abs(approvalwise_vectors - x), axis=1).min())
 
 
-def __distance_across_from_set(approvalwise_vectors: np.ndarray, other_approvalwise_vectors: np.ndarray) -> int:
-    return max(__distance_across(approvalwise_vectors, x) for x in other_approvalwise_vectors)
-
-
 def measure_iteration(approvalwise_vectors: list[ApprovalwiseVector], algorithm: Algorithm, **kwargs):
     start_time = time.process_time()
     farthest_approvalwise_vectors, distance = algorithm(
@@ -27,6 +24,8 @@ def how_long_reference_is_better(initial_approvalwise_vectors: list[Approvalwise
                                  reference_algorithm: Algorithm, heuristic_algorithm: Algorithm, csv_report_out: typing.TextIO, i_trial: int, max_generated: int = 1000, **heuristic_kwargs):
 
     approvalwise_vectors = initial_approvalwise_vectors[:]
+    distance_index = DistanceIndex(
+        approvalwise_vectors, tracked=reference_farthest_approvalwise_vectors)
     new_heuristic_approvalwise_vectors = []
     new_reference_approvalwise_vectors = []
 
@@ -39,6 +38,7 @@ def how_long_reference_is_better(initial_approvalwise_vectors: list[Approvalwise
         heuristic_approvalwise_vector, heuristic_distance, heuristic_dt = measure_iteration(
             approvalwise_vectors, heuristic_algorithm, **heuristic_kwargs)
         approvalwise_vectors.append(heuristic_approvalwise_vector)
+        distance_index.append(heuristic_approvalwise_vector)
         new_heuristic_approvalwise_vectors.append(
             heuristic_approvalwise_vector)
 
@@ -50,7 +50,7 @@ def how_long_reference_is_better(initial_approvalwise_vectors: list[Approvalwise
         # if heuristic_distance >= reference_distance:
         #     continue
 
-        if __distance_across_from_set(approvalwise_vectors, reference_farthest_approvalwise_vectors) >= reference_distance:
+        if distance_index.tracked_distances.max() >= reference_distance:
             continue
 
         new_reference_approvalwise_vector, new_reference_distance, new_reference_dt = measure_iteration(
@@ -7,40 +7,173 @@
 #include <vector>
 
 #include "approvalwise_vector.hpp"
-#include "greedy_dp.hpp"
+#include "two_vectors.hpp"
+#include "utils.hpp"
 
 namespace pairs {
-pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
+namespace {
+// Solves and scores given pairs of references and returns the farthest
+// candidate, ties broken by position in `pair_indices`.
+pair<approvalwise_vector_t, int> farthest_over_pairs(
     const vector<approvalwise_vector_t>& approvalwise_vectors,
-    const int num_voters) {
-    const int num_elections = approvalwise_vectors.size();
+    const ReferenceMatrix& references,
+    const vector<pair<int, int>>& pair_indices, const int num_voters,
+    const int num_threads) {
     const int num_candidates = approvalwise_vectors.front().size();
+    const int num_pairs = pair_indices.size();
 
-    vector<approvalwise_vector_t> vector_candidates;
-
-    for (size_t first_idx = 0; first_idx < num_elections; ++first_idx) {
-        for (size_t second_idx = first_idx + 1; second_idx < num_elections;
-             second_idx++) {
-            vector<approvalwise_vector_t> two_vectors = {
+    // Pairs are solved and scored independently by index, so the result does
+    // not depend on `num_threads`.
+    vector<approvalwise_vector_t> vector_candidates(num_pairs);
+    vi distances(num_pairs);
+    parallel_for(0, num_pairs, num_threads, [&](const int idx) {
+        const auto [first_idx, second_idx] = pair_indices[idx];
+        vector_candidates[idx] =
+            two_vectors::farthest_approvalwise_vector(
                 approvalwise_vectors[first_idx],
-                approvalwise_vectors[second_idx]};
-            vector_candidates.push_back(
-                greedy_dp::farthest_approvalwise_vector(two_vectors, num_voters)
-                    .first);
-        }
-    }
+                approvalwise_vectors[second_idx], num_voters)
+                .first;
+        distances[idx] =
+            score_across(references, vector_candidates[idx], num_voters);
+    });
 
     int best_distance = -1;
     approvalwise_vector_t best_vector(num_candidates);
-    for (const auto& candidate : vector_candidates) {
-        int distance =
-            score_across(approvalwise_vectors, candidate, num_voters);
-        if (distance > best_distance) {
-            best_distance = distance;
-            best_vector = candidate;
+    for (int idx = 0; idx < num_pairs; idx++) {
+        if (distances[idx] > best_distance) {
+            best_distance = distances[idx];
+            best_vector = vector_candidates[idx];
         }
     }
 
     return {best_vector, best_distance};
 }
+}  // namespace
+
+pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
+    const vector<approvalwise_vector_t>& approvalwise_vectors,
+    const ReferenceMatrix& references, const int num_voters,
+    const int num_threads) {
+    const int num_elections = approvalwise_vectors.size();
+
+    vector<pair<int, int>> pair_indices;
+    for (int first_idx = 0; first_idx < num_elections; ++first_idx) {
+        for (int second_idx = first_idx + 1; second_idx < num_elections;
+             second_idx++) {
+            pair_indices.push_back({first_idx, second_idx});
+        }
+    }
+
+    return farthest_over_pairs(approvalwise_vectors, references, pair_indices,
+                               num_voters, num_threads);
+}
+
+pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
+    const vector<approvalwise_vector_t>& approvalwise_vectors,
+    const int num_voters, const int num_threads) {
+    return farthest_approvalwise_vector(approvalwise_vectors,
+                                        ReferenceMatrix(approvalwise_vectors),
+                                        num_voters, num_threads);
+}
+
+pair<approvalwise_vector_t, int> farthest_approvalwise_vector_knn(
+    const vector<approvalwise_vector_t>& approvalwise_vectors,
+    const int num_voters, const int k, const int num_threads) {
+    const int num_elections = approvalwise_vectors.size();
+    const int num_neighbours = min(k, num_elections - 1);
+
+    // nearest and farthest references of every reference, rows are filled
+    // independently
+    vector<vi> neighbours(num_elections);
+    parallel_for(0, num_elections, num_threads, [&](const int first_idx) {
+        vector<pair<int, int>> by_distance;
+        for (int second_idx = 0; second_idx < num_elections; second_idx++) {
+            if (second_idx != first_idx) {
+                by_distance.push_back(
+                    {dist_l1(approvalwise_vectors[first_idx],
+                             approvalwise_vectors[second_idx]),
+                     second_idx});
+            }
+        }
+        sort(all(by_distance));
+        for (int i = 0; i < num_neighbours; i++) {
+            neighbours[first_idx].push_back(by_distance[i].second);
+            neighbours[first_idx].push_back(
+                by_distance[by_distance.size() - 1 - i].second);
+        }
+    });
+
+    // edges are undirected, ordered as in the full pairs
+    vector<pair<int, int>> pair_indices;
+    for (int first_idx = 0; first_idx < num_elections; first_idx++) {
+        for (const int second_idx : neighbours[first_idx]) {
+            pair_indices.push_back(
+                {min(first_idx, second_idx), max(first_idx, second_idx)});
+        }
+    }
+    sort(all(pair_indices));
+    pair_indices.erase(unique(all(pair_indices)), pair_indices.end());
+
+    auto result = farthest_over_pairs(approvalwise_vectors,
+                                      ReferenceMatrix(approvalwise_vectors),
+                                      pair_indices, num_voters, num_threads);
+    // distance 0 means every solved pair returned one of the references
+    if (result.second == 0) {
+        return farthest_approvalwise_vector(approvalwise_vectors, num_voters,
+                                            num_threads);
+    }
+    return result;
+}
+
+Session::Session(const int num_voters, const int num_candidates)
+    : num_voters(num_voters),
+      num_candidates(num_candidates),
+      matrix(num_candidates) {}
+
+void Session::add(const approvalwise_vector_t& approvalwise_vector) {
+    const int num_cached = distances.size();
+    for (int i = 0; i < num_cached; i++) {
+        const int* candidate = &candidates[i * num_candidates];
+        int distance = 0;
+        for (int x = 0; x < num_candidates; x++) {
+            distance += abs(candidate[x] - approvalwise_vector[x]);
+        }
+        distances[i] = min(distances[i], distance);
+    }
+
+    references.push_back(approvalwise_vector);
+    matrix.append(approvalwise_vector);
+    const int second_idx = references.size() - 1;
+    for (int first_idx = 0; first_idx < second_idx; first_idx++) {
+        const auto candidate =
+            two_vectors::farthest_approvalwise_vector(
+                references[first_idx], approvalwise_vector, num_voters)
+                .first;
+        candidates.insert(candidates.end(), all(candidate));
+        distances.push_back(score_across(matrix, candidate, num_voters));
+        first.push_back(first_idx);
+        second.push_back(second_idx);
+    }
+}
+
+pair<approvalwise_vector_t, int> Session::farthest() const {
+    // the batch version scans pairs ordered by (first, second) and keeps the
+    // first farthest one
+    int best = -1;
+    for (size_t i = 0; i < distances.size(); i++) {
+        if (best < 0 || distances[i] > distances[best] ||
+            (distances[i] == distances[best] &&
+             make_pair(first[i], second[i]) <
+                 make_pair(first[best], second[best]))) {
+            best = i;
+        }
+    }
+    if (best < 0) {
+        return {approvalwise_vector_t(num_candidates), -1};
+    }
+    return {approvalwise_vector_t(
+                candidates.begin() + best * num_candidates,
+                candidates.begin() + (best + 1) * num_candidates),
+            distances[best]};
+}
 }  // namespace pairs
\ No newline at end of file
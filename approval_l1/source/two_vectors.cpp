@@ -0,0 +1,129 @@
+#include "two_vectors.hpp"
+
+#include <algorithm>
+#include <vector>
+
+namespace two_vectors {
+
+namespace {
+// Prefix maximum over positions 0..size-1.
+class MaxFenwick {
+   public:
+    explicit MaxFenwick(const int size) : tree(size + 1, -1) {}
+
+    void update(int pos, const long long value) {
+        for (pos++; pos < (int)tree.size(); pos += pos & -pos) {
+            tree[pos] = max(tree[pos], value);
+        }
+    }
+
+    // maximum over positions [0, pos)
+    long long query(int pos) const {
+        long long res = -1;
+        for (; pos > 0; pos -= pos & -pos) {
+            res = max(res, tree[pos]);
+        }
+        return res;
+    }
+
+   private:
+    vector<long long> tree;
+};
+}  // namespace
+
+// With two references, greedy_dp at height y of column x picks the
+// predecessor y' >= y maximizing
+//     min(c0 + P0(y'), c1 + P1(y')) = c0 + min(P0(y'), P1(y') + D),
+// where c_r = |y - a_r[x]|, D = c1 - c0 and P_r are distances of the previous
+// column. For threshold t = P0(y') - P1(y'), the inner minimum is P1(y') + D
+// when t >= D and P0(y') otherwise. Sweeping y downwards adds y' = y to two
+// Fenwick trees indexed by threshold rank, one keeping P1 over thresholds
+// from the top and one keeping P0 from the bottom, so each height is answered
+// with two prefix maxima. Keys encode (value, y') so that ties pick the
+// largest y', as the scan in greedy_dp does.
+pair<approvalwise_vector_t, int> farthest_approvalwise_vector(
+    const approvalwise_vector_t& first, const approvalwise_vector_t& second,
+    const int num_voters) {
+    const int candidates_num = first.size();
+    const int heights_num = num_voters + 1;
+    // values inside keys are shifted to be non-negative, P1 + D >= -N
+    const long long offset = num_voters + 1;
+    const auto key = [&](const long long value, const int y) {
+        return (value + offset) * heights_num + y;
+    };
+
+    vi prev0(heights_num), prev1(heights_num);
+    vi cur0(heights_num), cur1(heights_num);
+    vi from(candidates_num * heights_num, -1);
+    for (int y = 0; y < heights_num; y++) {
+        cur0[y] = abs(y - first[0]);
+        cur1[y] = abs(y - second[0]);
+    }
+
+    vi thresholds(heights_num);
+    vi order(heights_num);
+    vi rank(heights_num);
+    for (int x = 1; x < candidates_num; x++) {
+        swap(prev0, cur0);
+        swap(prev1, cur1);
+
+        for (int y = 0; y < heights_num; y++) {
+            thresholds[y] = prev0[y] - prev1[y];
+            order[y] = y;
+        }
+        sort(all(order), [&](const int l, const int r) {
+            return thresholds[l] < thresholds[r];
+        });
+        for (int i = 0; i < heights_num; i++) {
+            rank[order[i]] = i;
+        }
+
+        // `low` is indexed by rank, `high` by reversed rank
+        MaxFenwick low(heights_num), high(heights_num);
+        for (int y = num_voters; y >= 0; --y) {
+            low.update(rank[y], key(prev0[y], y));
+            high.update(heights_num - 1 - rank[y], key(prev1[y], y));
+
+            const int c0 = abs(y - first[x]);
+            const int c1 = abs(y - second[x]);
+            const int d = c1 - c0;
+            // number of thresholds below d
+            const int below =
+                partition_point(all(order),
+                                [&](const int i) { return thresholds[i] < d; }) -
+                order.begin();
+
+            long long best = -1;
+            const long long from_high = high.query(heights_num - below);
+            if (from_high >= 0) {
+                const int y_prev = from_high % heights_num;
+                best = key(prev1[y_prev] + d, y_prev);
+            }
+            best = max(best, low.query(below));
+
+            const int y_prev = best % heights_num;
+            from[x * heights_num + y] = y_prev;
+            cur0[y] = c0 + prev0[y_prev];
+            cur1[y] = c1 + prev1[y_prev];
+        }
+    }
+
+    int y = 0;
+    int max_dist = -1;
+    for (int y_last = 0; y_last < heights_num; y_last++) {
+        const int dist = min(cur0[y_last], cur1[y_last]);
+        if (dist > max_dist) {
+            max_dist = dist;
+            y = y_last;
+        }
+    }
+
+    approvalwise_vector_t res(candidates_num);
+    res.back() = y;
+    for (int x = candidates_num - 2; x >= 0; x--) {
+        y = from[(x + 1) * heights_num + y];
+        res[x] = y;
+    }
+    return {res, max_dist};
+}
+}  // namespace two_vectors
@@ -3,7 +3,7 @@ import os
 import time
 
 import pandas as pd
-from scripts.algorithms import algorithms
+from scripts.algorithms import get_algorithm
 from scripts.approvalwise_vector import dump_to_text_file, load_from_text_file
 
 parser = argparse.ArgumentParser(
@@ -49,7 +49,7 @@ for i_trial in i_trials:
         approvalwise_vectors = load_from_text_file(file)
         approvalwise_vectors = list(approvalwise_vectors.values())
 
-    algorithm = algorithms[algorithm_id]
+    algorithm = get_algorithm(algorithm_id)
     starting_approval_vectors = approvalwise_vectors
     new_approvalwise_vectors = []
 
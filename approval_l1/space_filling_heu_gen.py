@@ -4,7 +4,7 @@ import os
 import numpy as np
 import pickle
 from scripts.approvalwise_vector import ApprovalwiseVector, dump_to_text_file, load_from_text_file
-from scripts.algorithms import algorithms
+from scripts.algorithms import get_algorithm
 
 from itertools import product, chain
 
@@ -45,7 +45,7 @@ for family_id, algorithm_id, i_start, i_trial in experiment_configurations:
         reference_new_approvalwise_vectors = list(map(lambda x: ApprovalwiseVector(list(sorted(x, reverse=True)), num_voters),
                                                       reference_new_approvalwise_vectors.values()))
 
-    algorithm = algorithms[algorithm_id]
+    algorithm = get_algorithm(algorithm_id)
     starting_approval_vectors = approvalwise_vectors + \
         reference_new_approvalwise_vectors[:i_start]
     new_approvalwise_vectors = []
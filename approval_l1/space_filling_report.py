@@ -6,6 +6,7 @@ import os
 import numpy as np
 import mapel.elections as mapel
 from scripts.approvalwise_vector import add_sampled_elections_to_experiment, load_from_text_file
+from scripts.distances import l1_distance, l1_index
 
 import seaborn as sns
 
@@ -45,13 +46,7 @@ reference_new_approvalwise_vectors = list(
 with open(os.path.join('experiments', experiment_id, 'elections.txt'), 'r') as file:
     approvalwise_vectors = load_from_text_file(file)
 approvalwise_vectors = list(approvalwise_vectors.values())
-
-
-def l1_distance(av, other_avs) -> int:
-    # print(av, other_avs)
-    av = np.array(av).reshape(1, -1)
-    other_avs = np.array(other_avs)
-    return np.min(np.sum(np.abs(av - other_avs), axis=1))
+approvalwise_index = l1_index(approvalwise_vectors)
 
 
 def calculate_space_filling_metric_reference(algorithm: str, i_start: int):
@@ -64,7 +59,7 @@ def calculate_space_filling_metric_reference(algorithm: str, i_start: int):
 
     for i in range(len(vectors)):
         metric = np.mean(
-            [l1_distance(vector, approvalwise_vectors + vectors[:j] + vectors[j+1:i+1])
+            [l1_distance(vector, approvalwise_index, vectors[:j] + vectors[j+1:i+1])
              for j, vector in enumerate(vectors[:i+1])]
         )
         metrics.append(metric)
@@ -95,7 +90,7 @@ def calculate_space_filling_metric_heuristic(algorithm: str, i_start: int, trial
 
         for i in range(len(vectors)):
             metric = np.mean(
-                [l1_distance(vector, approvalwise_vectors + reference_vectors + vectors[:j] + vectors[j+1:i+1])
+                [l1_distance(vector, approvalwise_index, reference_vectors + vectors[:j] + vectors[j+1:i+1])
                  for j, vector in enumerate(vectors[:i+1])]
             )
             metrics.append(metric)
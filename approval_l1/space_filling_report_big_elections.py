@@ -11,6 +11,7 @@ from scripts.approvalwise_vector import (
     add_sampled_elections_to_experiment,
     load_from_text_file,
 )
+from scripts.distances import l1_distance, l1_index
 
 plt.rcParams['figure.dpi'] = 300
 
@@ -41,12 +42,7 @@ os.makedirs(plot_dir, exist_ok=True)
 with open(os.path.join('experiments', experiment_id, 'elections.txt'), 'r') as file:
     approvalwise_vectors = load_from_text_file(file)
 approvalwise_vectors = list(approvalwise_vectors.values())
-
-
-def l1_distance(av, other_avs) -> int:
-    av = np.array(av).reshape(1, -1)
-    other_avs = np.array(other_avs)
-    return np.min(np.sum(np.abs(av - other_avs), axis=1))
+approvalwise_index = l1_index(approvalwise_vectors)
 
 
 def add_compass(experiment: mapel.ApprovalElectionExperiment):
@@ -71,7 +67,7 @@ def calculate_space_filling_metric_heuristic(algorithm: str, i_start: int, trial
 
         for i in range(len(vectors)):
             metric = np.mean(
-                [l1_distance(vector, approvalwise_vectors + vectors[:j] + vectors[j+1:i+1])
+                [l1_distance(vector, approvalwise_index, vectors[:j] + vectors[j+1:i+1])
                  for j, vector in enumerate(vectors[:i+1])]
             )
             metrics.append(metric)
@@ -0,0 +1,83 @@
+import argparse
+import os
+
+import pandas as pd
+from scripts.approvalwise_vector import load_from_text_file
+from scripts.basin_hopping import basin_hopping
+from scripts.bindings import greedy_dp
+
+parser = argparse.ArgumentParser(
+    description='Compare iterations to reach a target distance of basin hopping with fixed and adaptive step parameters')
+parser.add_argument('--experiments', type=str, nargs='+',
+                    default=['20x50', '30x60'], help='Experiment IDs, i.e. <num_candidates>x<num_voters>')
+parser.add_argument('--families', type=str, nargs='+',
+                    default=['noise', 'truncated_urn', 'euclidean', 'resampling'], help='Family IDs')
+parser.add_argument('--target-ratio', type=float, default=1.0,
+                    help='Target distance as a fraction of the greedy DP distance on the same references')
+parser.add_argument('--niter', type=int, default=20000,
+                    help='Iteration limit of a run, counted as iterations to target when the target is not reached')
+parser.add_argument('--seeds', type=int, default=10,
+                    help='Number of runs per configuration')
+parser.add_argument('--step-size', type=int, default=7,
+                    help='Fixed, or for the adaptive runs initial, step size')
+parser.add_argument('--big-step-chance', type=float, default=0.2,
+                    help='Fixed, or for the adaptive runs initial, big step chance')
+parser.add_argument('--engine', type=str, default='lattice',
+                    choices=['scipy', 'lattice'], help='Basin hopping engine')
+
+args = parser.parse_args()
+
+report_rows = []
+for experiment_id in args.experiments:
+    for family_id in args.families:
+        elections_path = os.path.join(
+            'experiments', experiment_id, family_id, 'elections.txt')
+        if not os.path.exists(elections_path):
+            print(f'Skipping {experiment_id} {family_id}, no {elections_path}')
+            continue
+        with open(elections_path, 'r') as file:
+            approvalwise_vectors = list(load_from_text_file(file).values())
+
+        _, greedy_distance = greedy_dp(approvalwise_vectors)
+        target_distance = int(args.target_ratio * greedy_distance)
+        print(f'Running {experiment_id} {family_id} to distance {target_distance}')
+        for adaptive in [False, True]:
+            for seed in range(args.seeds):
+                _, distance, info = basin_hopping(
+                    approvalwise_vectors,
+                    niter=args.niter,
+                    step_size=args.step_size,
+                    big_step_chance=args.big_step_chance,
+                    seed=seed,
+                    engine=args.engine,
+                    target_distance=target_distance,
+                    adaptive=adaptive,
+                    full_output=True,
+                )
+                report_rows.append({
+                    'experiment_id': experiment_id,
+                    'family_id': family_id,
+                    'adaptive': adaptive,
+                    'seed': seed,
+                    'target_distance': target_distance,
+                    'distance': distance,
+                    'reached': info['stop_reason'] == 'target_distance',
+                    'iterations': info['nit'],
+                })
+
+if not report_rows:
+    raise SystemExit('No experiments found')
+
+report = pd.DataFrame(report_rows)
+results_dir = os.path.join('results', 'step_tuner')
+os.makedirs(results_dir, exist_ok=True)
+report.to_csv(os.path.join(results_dir, 'step_tuner_report.csv'), index=False)
+
+# runs that missed the target count with the whole iteration limit
+summary = report.groupby(['experiment_id', 'adaptive']).agg(
+    reach_rate=('reached', 'mean'),
+    mean_iterations=('iterations', 'mean'),
+    median_iterations=('iterations', 'median'),
+)
+summary.to_csv(os.path.join(results_dir, 'step_tuner_summary.csv'))
+print(summary.to_string())
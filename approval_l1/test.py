@@ -1,8 +1,241 @@
-from scripts.bindings import greedy_dp, pairs
+import itertools
+
+import numpy as np
+
+from scripts.approvalwise_vector import ApprovalwiseVector, ApprovalwiseVectorSet
+from scripts.basin_hopping import basin_hopping
+from scripts.bindings import PairsSession, brute, greedy_dp, pairs, pairs_knn
+from scripts.distances import ApprovalSumIndex, l1_distance, l1_index
+from scripts.vp_tree import VPTree
+
+
+def random_approvalwise_vectors(rng: np.random.Generator, num_voters: int, num_candidates: int,
+                                num_instances: int) -> list[ApprovalwiseVector]:
+    # few distinct values make equal distances, and hence tie-breaking, frequent
+    approvalwise_vectors = []
+    for _ in range(num_instances):
+        values = rng.integers(0, num_voters + 1, 3 if rng.random() < 0.25 else num_voters + 1)
+        vector = np.sort(rng.choice(values, num_candidates))[::-1]
+        approvalwise_vectors.append(ApprovalwiseVector(vector, num_voters))
+    return approvalwise_vectors
+
+
+def linear_min_distance(x, approvalwise_vectors) -> int:
+    return int(np.sum(np.abs(np.asarray(approvalwise_vectors) - np.asarray(x)), axis=1).min())
+
+
+def check_vp_tree(seed: int = 0, num_trials: int = 20):
+    rng = np.random.default_rng(seed)
+    for _ in range(num_trials):
+        num_voters, num_candidates = rng.integers(1, 40), rng.integers(1, 20)
+        references = random_approvalwise_vectors(rng, num_voters, num_candidates, rng.integers(1, 200))
+        tree = VPTree(references, leaf_size=4, seed=seed)
+        tree.extend(random_approvalwise_vectors(rng, num_voters, num_candidates, 50))
+        references = np.asarray(tree)
+        for x in random_approvalwise_vectors(rng, num_voters, num_candidates, 20):
+            distances = np.sum(np.abs(references - x), axis=1)
+            idx, distance = tree.nearest(x)
+            assert distance == distances.min() == distances[idx]
+            radius = int(rng.integers(0, num_voters * num_candidates + 1))
+            assert sorted(tree.within(x, radius)) == np.flatnonzero(distances <= radius).tolist()
+
+            others = np.asarray(random_approvalwise_vectors(rng, num_voters, num_candidates, 3))
+            expected = min(distances.min(), linear_min_distance(x, others))
+            assert l1_distance(x, l1_index(references, threshold=1), others) == expected
+            assert l1_distance(x, l1_index(references), others[:0]) == distances.min()
+
+
+def check_approval_sum_index(seed: int = 0, num_trials: int = 20):
+    rng = np.random.default_rng(seed)
+    for _ in range(num_trials):
+        num_voters, num_candidates = rng.integers(1, 40), rng.integers(1, 20)
+        references = random_approvalwise_vectors(rng, num_voters, num_candidates, rng.integers(1, 200))
+        index = ApprovalSumIndex(references, num_segments=4, block_size=8)
+        # a copy extended on its own must not change the original
+        extended = index.copy()
+        inserted = random_approvalwise_vectors(rng, num_voters, num_candidates, 50)
+        for x in inserted:
+            extended.insert(x)
+        assert len(index) == len(references)
+
+        for x in random_approvalwise_vectors(rng, num_voters, num_candidates, 20):
+            distance = linear_min_distance(x, references)
+            assert index.min_distance(x) == distance
+            assert extended.min_distance(x) == linear_min_distance(x, references + inserted)
+            stop_below = int(rng.integers(0, distance + 2))
+            assert (index.min_distance(x, stop_below=stop_below) < stop_below) == (distance < stop_below)
+
+
+def check_approvalwise_vector_set(seed: int = 0, num_trials: int = 10):
+    rng = np.random.default_rng(seed)
+    for _ in range(num_trials):
+        num_voters, num_candidates = rng.integers(1, 30), rng.integers(1, 12)
+        approvalwise_vectors = random_approvalwise_vectors(rng, num_voters, num_candidates, rng.integers(2, 12))
+        approvalwise_vector_set = ApprovalwiseVectorSet(num_voters, num_candidates, capacity=1)
+        for approvalwise_vector in approvalwise_vectors:
+            approvalwise_vector_set.append(approvalwise_vector)
+        assert np.array_equal(approvalwise_vector_set, approvalwise_vectors)
+        assert all(np.array_equal(a, b) for a, b in zip(approvalwise_vector_set, approvalwise_vectors))
+        # slices copy, as for lists
+        head = approvalwise_vector_set[:1]
+        head.append(approvalwise_vectors[-1])
+        assert len(approvalwise_vector_set) == len(approvalwise_vectors)
+
+        for algorithm in [greedy_dp, pairs]:
+            vector, distance = algorithm(approvalwise_vectors)
+            set_vector, set_distance = algorithm(approvalwise_vector_set)
+            assert distance == set_distance and np.array_equal(vector, set_vector)
+        assert basin_hopping(approvalwise_vectors, niter=50, seed=seed, engine='lattice')[1] == \
+            basin_hopping(approvalwise_vector_set, niter=50, seed=seed, engine='lattice')[1]
+
+    try:
+        ApprovalwiseVectorSet(3, 2).append([1, 2])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ApprovalwiseVectorSet accepted an increasing vector')
+
+
+def full_grid_greedy_dp(approvalwise_vectors: list[ApprovalwiseVector], num_voters: int) -> tuple[np.ndarray, int]:
+    # the greedy DP over every height 0..N of every column, with the ties of `greedy_dp`: the highest previous
+    # height for a cell and the lowest terminal height
+    references = np.asarray(approvalwise_vectors)
+    num_candidates = references.shape[1]
+    heights = np.arange(num_voters + 1)
+    dp = np.abs(heights[:, None] - references[:, 0])
+    from_heights = np.zeros((num_candidates, num_voters + 1), dtype=int)
+    for x in range(1, num_candidates):
+        cost = np.abs(heights[:, None] - references[:, x])
+        new_dp = np.zeros_like(dp)
+        for y in heights:
+            min_for_prev = np.min(cost[y] + dp[y:], axis=1)
+            y_prev = num_voters - int(np.argmax(min_for_prev[::-1]))
+            new_dp[y] = cost[y] + dp[y_prev]
+            from_heights[x, y] = y_prev
+        dp = new_dp
+
+    y = int(np.argmax(dp.min(axis=1)))
+    distance = int(dp[y].min())
+    vector = np.zeros(num_candidates, dtype=int)
+    for x in range(num_candidates - 1, -1, -1):
+        vector[x] = y
+        y = from_heights[x, y]
+    return vector, distance
+
+
+def check_greedy_dp(seed: int = 0, num_trials: int = 200):
+    rng = np.random.default_rng(seed)
+    for _ in range(num_trials):
+        num_voters, num_candidates = rng.integers(1, 30), rng.integers(1, 12)
+        approvalwise_vectors = random_approvalwise_vectors(rng, num_voters, num_candidates, rng.integers(1, 8))
+        vector, distance = greedy_dp(approvalwise_vectors)
+        expected_vector, expected_distance = full_grid_greedy_dp(approvalwise_vectors, num_voters)
+        assert distance == expected_distance and np.array_equal(vector, expected_vector)
+
+
+def check_pairs_session(seed: int = 0, num_trials: int = 10, num_steps: int = 10):
+    rng = np.random.default_rng(seed)
+    session = PairsSession()
+    for _ in range(num_trials):
+        # the same session is reused for sequences of other sizes
+        num_voters, num_candidates = rng.integers(1, 30), rng.integers(1, 12)
+        approvalwise_vectors = random_approvalwise_vectors(rng, num_voters, num_candidates, rng.integers(2, 5))
+        for _ in range(num_steps):
+            vector, distance = session(approvalwise_vectors)
+            expected_vector, expected_distance = pairs(approvalwise_vectors)
+            assert distance == expected_distance and np.array_equal(vector, expected_vector)
+            approvalwise_vectors.append(random_approvalwise_vectors(rng, num_voters, num_candidates, 1)[0])
+
+        # another sequence of the same length, differing in the last seen reference
+        approvalwise_vectors = approvalwise_vectors[:-2] + \
+            random_approvalwise_vectors(rng, num_voters, num_candidates, 1)
+        assert session(approvalwise_vectors)[1] == pairs(approvalwise_vectors)[1]
+
+
+def check_pairs_threads(seed: int = 0, num_trials: int = 10):
+    rng = np.random.default_rng(seed)
+    for _ in range(num_trials):
+        num_voters, num_candidates = rng.integers(1, 30), rng.integers(1, 12)
+        approvalwise_vectors = random_approvalwise_vectors(rng, num_voters, num_candidates, rng.integers(2, 20))
+        vector, distance = pairs(approvalwise_vectors, num_threads=1)
+        for num_threads in [2, 3, 0]:
+            threads_vector, threads_distance = pairs(approvalwise_vectors, num_threads=num_threads)
+            assert distance == threads_distance and np.array_equal(vector, threads_vector)
+
+
+def naive_pairs(approvalwise_vectors: list[ApprovalwiseVector]) -> tuple[np.ndarray, int]:
+    # greedy DP on every pair of references, the first farthest pair in (first, second) order wins
+    best_vector, best_distance = None, -1
+    for first in range(len(approvalwise_vectors)):
+        for second in range(first + 1, len(approvalwise_vectors)):
+            vector, _ = greedy_dp([approvalwise_vectors[first], approvalwise_vectors[second]], num_threads=1)
+            distance = linear_min_distance(vector, approvalwise_vectors)
+            if distance > best_distance:
+                best_vector, best_distance = vector, distance
+    return best_vector, best_distance
+
+
+def check_pairs(seed: int = 0, num_trials: int = 100):
+    rng = np.random.default_rng(seed)
+    for _ in range(num_trials):
+        num_voters, num_candidates = rng.integers(1, 30), rng.integers(1, 12)
+        approvalwise_vectors = random_approvalwise_vectors(rng, num_voters, num_candidates, rng.integers(2, 8))
+        vector, distance = pairs(approvalwise_vectors)
+        expected_vector, expected_distance = naive_pairs(approvalwise_vectors)
+        assert distance == expected_distance and np.array_equal(vector, expected_vector)
+
+
+def check_pairs_knn(seed: int = 0, num_trials: int = 50):
+    rng = np.random.default_rng(seed)
+    for _ in range(num_trials):
+        num_voters, num_candidates = rng.integers(1, 30), rng.integers(1, 12)
+        approvalwise_vectors = random_approvalwise_vectors(rng, num_voters, num_candidates, rng.integers(2, 20))
+        # with the corner vectors as references, near pairs alone return only references
+        approvalwise_vectors += [ApprovalwiseVector([num_voters] * num_candidates, num_voters),
+                                 ApprovalwiseVector([0] * num_candidates, num_voters)]
+        vector, distance = pairs(approvalwise_vectors)
+        # all pairs are joined once k reaches R - 1
+        knn_vector, knn_distance = pairs_knn(approvalwise_vectors, k=len(approvalwise_vectors) - 1)
+        assert distance == knn_distance and np.array_equal(vector, knn_vector)
+
+        for k in [1, 2]:
+            knn_vector, knn_distance = pairs_knn(approvalwise_vectors, k=k)
+            assert knn_distance == linear_min_distance(knn_vector, approvalwise_vectors) <= distance
+            assert knn_distance > 0 or distance == 0
+
+
+def check_brute(seed: int = 0, num_trials: int = 50):
+    rng = np.random.default_rng(seed)
+    for _ in range(num_trials):
+        num_voters, num_candidates = rng.integers(1, 7), rng.integers(1, 6)
+        approvalwise_vectors = random_approvalwise_vectors(rng, num_voters, num_candidates, rng.integers(1, 6))
+        # every non increasing vector of heights 0..N
+        all_vectors = np.array(list(itertools.combinations_with_replacement(
+            range(num_voters, -1, -1), num_candidates)))
+        expected_distance = int(np.max([linear_min_distance(x, approvalwise_vectors) for x in all_vectors]))
+        vector, distance = brute(approvalwise_vectors)
+        assert distance == expected_distance == linear_min_distance(vector, approvalwise_vectors)
 
 
 if __name__ == "__main__":
-    from scripts.approvalwise_vector import ApprovalwiseVector
+    print("Checking VPTree against linear scan...")
+    check_vp_tree()
+    print("Checking ApprovalSumIndex against linear scan...")
+    check_approval_sum_index()
+    print("Checking ApprovalwiseVectorSet against lists...")
+    check_approvalwise_vector_set()
+    print("Checking greedy_dp against the full grid DP...")
+    check_greedy_dp()
+    print("Checking PairsSession against pairs...")
+    check_pairs_session()
+    print("Checking pairs on several threads...")
+    check_pairs_threads()
+    print("Checking pairs against greedy_dp on every pair...")
+    check_pairs()
+    print("Checking pairs_knn against pairs...")
+    check_pairs_knn()
+    print("Checking brute against exhaustive search...")
+    check_brute()
 
     num_candidates = 10
     num_voters = 100